@@ -0,0 +1,87 @@
+"""Columnar read benchmark
+
+Generates a Python module for a small record type, writes a file of records
+and compares summing one field with read_many against read_columns.
+
+Usage:
+    python benchmarks/columns_benchmark.py [<records>] [<repeat>]
+"""
+
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import wick
+
+
+source_text = """
+struct Sample {
+    unsigned int id;
+    char channel[8];
+    short flags;
+    double value;
+    float position[3];
+};
+"""
+
+
+def benchmark(function, repeat):
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+
+    return result, best
+
+
+def load_module(out_directory):
+    wick.generate_project(source_text, 'python', out_directory, 'samples.h')
+
+    path = os.path.join(out_directory, 'samples.py')
+    spec = importlib.util.spec_from_file_location('samples', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def main():
+    record_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with tempfile.TemporaryDirectory() as out_directory:
+        Sample = load_module(out_directory).Sample
+
+        buff = io.BytesIO()
+        Sample.write_many(buff, [Sample(i, b'ch', 0, i * 0.5, 0, 0, 0) for i in range(record_count)])
+        data = buff.getvalue()
+
+        def read_objects():
+            return sum(s.value for s in Sample.read_many(io.BytesIO(data)))
+
+        def read_columns():
+            return sum(Sample.read_columns(data)['value'])
+
+        expected, object_elapsed = benchmark(read_objects, repeat)
+        actual, column_elapsed = benchmark(read_columns, repeat)
+
+        assert expected == actual
+
+    print(f'records:            {record_count}')
+    print(f'data size:          {len(data)} bytes')
+    print(f'read_many + sum:    {object_elapsed:.3f}s')
+    print(f'read_columns + sum: {column_elapsed:.3f}s')
+    print(f'speedup:            {object_elapsed / column_elapsed:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
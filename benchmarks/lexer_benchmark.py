@@ -0,0 +1,71 @@
+"""Lexer throughput benchmark
+
+Lexes a large synthetic header and reports tokens per second.
+
+Usage:
+    python benchmarks/lexer_benchmark.py [<structs>] [<repeat>]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from wick.parser.lexer import new_lexer
+
+
+def generate_header(struct_count):
+    """Generates C source text with the given number of structs."""
+
+    lines = []
+
+    for i in range(struct_count):
+        lines.append(f'/* Description of struct {i} */')
+        lines.append(f'struct Record{i} {{')
+        lines.append('    // Record name')
+        lines.append('    char name[64];')
+        lines.append('')
+        lines.append('    // Record id')
+        lines.append('    unsigned int id;')
+        lines.append('    float position[3];')
+        lines.append('    long long flags, mask;')
+        lines.append('};')
+        lines.append('')
+
+    return '\n'.join(lines)
+
+
+def benchmark(source, repeat):
+    best = None
+    token_count = 0
+
+    for _ in range(repeat):
+        lexer = new_lexer(source)
+        token_count = 0
+
+        start = time.perf_counter()
+        while lexer.lex():
+            token_count += 1
+        elapsed = time.perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+
+    return token_count, best
+
+
+def main():
+    struct_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    source = generate_header(struct_count)
+    token_count, elapsed = benchmark(source, repeat)
+
+    print(f'source size: {len(source)} bytes')
+    print(f'tokens:      {token_count}')
+    print(f'best time:   {elapsed:.3f}s')
+    print(f'throughput:  {token_count / elapsed:,.0f} tokens/sec')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Parser benchmark
+
+Parses a large synthetic header and reports the cost per token.
+
+Usage:
+    python benchmarks/parser_benchmark.py [<structs>] [<repeat>]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lexer_benchmark import generate_header
+from wick.parser.parser import Object, grammar, parse
+
+
+def benchmark(function, repeat):
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+
+    return result, best
+
+
+def main():
+    struct_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    source = generate_header(struct_count)
+    parse_tree, elapsed = benchmark(lambda: parse(source), repeat)
+    token_count = len(parse_tree.symbols)
+
+    print(f'source size:     {len(source)} bytes')
+    print(f'tokens:          {token_count}')
+    print(f'best parse time: {elapsed:.3f}s')
+    print(f'per token:       {elapsed / token_count * 1e6:.2f}us')
+
+    prototype = grammar.symbol_table['(name)']
+    count = 100000
+    _, elapsed = benchmark(lambda: [Object.create(prototype) for _ in range(count)], repeat)
+
+    print(f'Object.create:   {elapsed / count * 1e6:.2f}us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Startup benchmark
+
+Runs the CLI under python -X importtime and reports the cumulative import time
+of the slowest top level modules.
+
+Usage:
+    python benchmarks/startup_benchmark.py [<repeat>]
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def import_times():
+    """Returns a dict of top level module name to cumulative microseconds."""
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'wick.cli', '--version'],
+        cwd=root,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+
+    times = {}
+
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| (\S.*)$', line)
+
+        if match:
+            times[match.group(2)] = int(match.group(1))
+
+    return times
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    runs = [import_times() for _ in range(repeat)]
+    best = {name: min(run.get(name, 0) for run in runs) for name in runs[0]}
+    total = min(sum(run.values()) for run in runs)
+
+    for name, elapsed in sorted(best.items(), key=lambda item: -item[1])[:10]:
+        print(f'{name:<28} {elapsed / 1000:8.2f}ms')
+
+    print(f'{"total":<28} {total / 1000:8.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+import os
+import tempfile
+
+from unittest import mock
+
+from wick.generators import common
+
+
+_directory = None
+_patcher = None
+
+
+def _clear_caches():
+    from wick.generators import csharp, javascript, numpy, python
+
+    common.get_bytecode_cache.cache_clear()
+
+    for generator in [csharp, javascript, numpy, python]:
+        generator.get_environment.cache_clear()
+
+
+def start():
+    """Points WICK_CACHE_DIR at a temporary directory.
+
+    Generator environments are cleared so compiled templates are written
+    there instead of the user cache.
+    """
+
+    global _directory, _patcher
+
+    _directory = tempfile.TemporaryDirectory()
+    _patcher = mock.patch.dict(os.environ, {'WICK_CACHE_DIR': _directory.name})
+    _patcher.start()
+    _clear_caches()
+
+
+def stop():
+    """Restores WICK_CACHE_DIR and removes the temporary directory."""
+
+    _patcher.stop()
+    _clear_caches()
+    _directory.cleanup()
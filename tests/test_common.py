@@ -0,0 +1,204 @@
+import unittest
+
+from wick.common import Program, check_byte_order, parse_layout
+from wick.parser.parser import parse
+
+
+class TestProgram(unittest.TestCase):
+    def get_struct(self, program, name):
+        matches = [s for s in program.structs if s.name == name]
+
+        return matches[0] if matches else None
+
+    def get_member(self, struct, name):
+        matches = [m for m in struct.members if m.name == name]
+
+        return matches[0] if matches else None
+
+    def test_comment_above(self):
+        source_text = """
+/* Description of A */
+struct A {
+    // Description of a
+    int a;
+};"""
+        program = Program('test.h', parse(source_text))
+
+        struct = self.get_struct(program, 'A')
+        self.assertEqual(struct.description, 'Description of A', 'Description should be "Description of A"')
+
+        member = self.get_member(struct, 'a')
+        self.assertEqual(member.description, ' Description of a', 'Description should be "Description of a"')
+
+    def test_comment_on_same_line(self):
+        source_text = """
+struct A {
+    int a; // Description of a
+    int b; /* Description of b */
+};"""
+        program = Program('test.h', parse(source_text))
+        struct = self.get_struct(program, 'A')
+
+        member = self.get_member(struct, 'a')
+        self.assertEqual(member.description, ' Description of a', 'Description should be "Description of a"')
+
+        member = self.get_member(struct, 'b')
+        self.assertEqual(member.description, 'Description of b', 'Description should be "Description of b"')
+
+    def test_comment_above_blocked_by_symbol(self):
+        source_text = """
+struct A {
+    // Description of a
+    int a;
+    int b;
+};"""
+        program = Program('test.h', parse(source_text))
+        struct = self.get_struct(program, 'A')
+
+        member = self.get_member(struct, 'b')
+        self.assertEqual(member.description, '', 'Description should be empty')
+
+    def test_multi_line_comment(self):
+        source_text = """
+struct A {
+    /*
+     * Description
+     * of a
+     */
+    int a;
+};"""
+        program = Program('test.h', parse(source_text))
+        struct = self.get_struct(program, 'A')
+
+        member = self.get_member(struct, 'a')
+        self.assertEqual(member.description, '\nDescription\nof a\n', 'Leading asterisks should be removed')
+
+    def test_many_members(self):
+        members = ''.join(f'    // Register {i}\n    unsigned int r{i};\n' for i in range(1000))
+        source_text = f'struct Registers {{\n{members}}};'
+        program = Program('test.h', parse(source_text))
+        struct = self.get_struct(program, 'Registers')
+
+        for i, member in enumerate(struct.members):
+            self.assertEqual(member.description, f' Register {i}', f'Description should be "Register {i}"')
+
+
+
+class TestLayout(unittest.TestCase):
+    source_text = """
+struct A {
+    char tag;
+    double weight;
+    short values[3];
+    char name[5];
+    int id;
+    unsigned char flag;
+};"""
+
+    def get_layout(self, layout):
+        struct = Program('test.h', parse(self.source_text), layout).structs[0]
+
+        return [m.offset for m in struct.members], [m.padding for m in struct.members], struct.padding, struct.size
+
+    def test_packed(self):
+        offsets, padding, struct_padding, size = self.get_layout('packed')
+
+        self.assertEqual(offsets, [0, 1, 9, 15, 20, 24], 'Members should not be aligned')
+        self.assertEqual(padding, [0] * 6, 'Members should not be padded')
+        self.assertEqual((struct_padding, size), (0, 25), 'Size should be the sum of the member sizes')
+
+    def test_natural(self):
+        offsets, padding, struct_padding, size = self.get_layout('natural')
+
+        self.assertEqual(offsets, [0, 8, 16, 22, 28, 32], 'Members should be aligned to their element size')
+        self.assertEqual(padding, [0, 7, 0, 0, 1, 0], 'Padding should precede aligned members')
+        self.assertEqual((struct_padding, size), (7, 40), 'Size should be a multiple of the largest alignment')
+
+    def test_pack(self):
+        offsets, padding, struct_padding, size = self.get_layout('pack(2)')
+
+        self.assertEqual(offsets, [0, 2, 10, 16, 22, 26], 'Alignment should be limited to 2 bytes')
+        self.assertEqual((struct_padding, size), (1, 28), 'Size should be a multiple of 2')
+
+    def test_invalid(self):
+        for layout in ['aligned', 'pack(3)', 'pack()']:
+            with self.assertRaises(ValueError):
+                parse_layout(layout)
+
+
+class TestByteOrder(unittest.TestCase):
+    source_text = 'struct A { short a; };\nstruct B { struct A a; };'
+
+    def test_default(self):
+        program = Program('test.h', parse(self.source_text))
+
+        self.assertEqual(program.byte_order, 'little', 'Default byte order should be little endian')
+        self.assertEqual([s.byte_order for s in program.structs], ['little', 'little'], 'Structs should be little endian')
+
+    def test_big(self):
+        program = Program('test.h', parse(self.source_text), byte_order='big')
+
+        self.assertEqual([s.byte_order for s in program.structs], ['big', 'big'], 'Structs should carry the program byte order')
+        self.assertEqual(program.structs[1].size, 2, 'Byte order should not change the layout')
+
+    def test_invalid(self):
+        for byte_order in ['network', 'Big', '<']:
+            with self.assertRaises(ValueError):
+                check_byte_order(byte_order)
+
+
+class TestNestedStructs(unittest.TestCase):
+    source_text = """
+typedef struct {
+    short x;
+    char tag;
+} Point;
+
+struct Line {
+    unsigned char id;
+    Point points[2];
+};
+
+struct Shape {
+    struct Line line;
+    double area;
+};"""
+
+    def get_struct(self, layout, name):
+        program = Program('test.h', parse(self.source_text), layout)
+
+        return [s for s in program.structs if s.name == name][0]
+
+    def test_members(self):
+        struct = self.get_struct('natural', 'Shape')
+
+        self.assertEqual([(m.name, m.type, m.offset, m.size) for m in struct.members], [('line', 'Line', 0, 10), ('area', 'double', 16, 8)], 'Struct members should be laid out as a whole')
+        self.assertEqual(struct.members[0].struct.name, 'Line', 'Member should reference its struct')
+        self.assertIsNone(struct.members[1].struct, 'Primitive members should not reference a struct')
+        self.assertEqual((struct.alignment, struct.size), (8, 24), 'Struct should be aligned to its largest member')
+
+    def test_fields(self):
+        struct = self.get_struct('natural', 'Shape')
+
+        self.assertEqual(
+            [(f.name, f.path, f.offset) for f in struct.fields],
+            [
+                ('line_id', 'line.id', 0),
+                ('line_points_0_x', 'line.points[0].x', 2),
+                ('line_points_0_tag', 'line.points[0].tag', 4),
+                ('line_points_1_x', 'line.points[1].x', 6),
+                ('line_points_1_tag', 'line.points[1].tag', 8),
+                ('area', 'area', 16)
+            ],
+            'Fields should be flattened with offsets from the outer struct'
+        )
+
+    def test_packed(self):
+        struct = self.get_struct('packed', 'Line')
+
+        self.assertEqual([f.offset for f in struct.fields], [0, 1, 3, 4, 6], 'Packed fields should not be aligned')
+        self.assertEqual(struct.size, 7, 'Size should be the sum of the member sizes')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,308 @@
+import os
+import tempfile
+import unittest
+
+from collections import namedtuple
+from unittest import mock
+
+import temporary_cache
+
+import wick
+
+from wick import generators
+from wick.generators import common
+
+
+def setUpModule():
+    temporary_cache.start()
+
+
+def tearDownModule():
+    temporary_cache.stop()
+
+
+EntryPoint = namedtuple('EntryPoint', ['name', 'load'])
+DistEntryPoint = namedtuple('DistEntryPoint', ['name', 'load', 'dist'])
+Distribution = namedtuple('Distribution', ['project_name', 'version'])
+Generator = namedtuple('Generator', ['generate_project'])
+
+
+def get_generator(language):
+    def generate_project(program, out_directory):
+        path = os.path.join(out_directory, f'{program.name}.txt')
+
+        with open(path, 'w') as file:
+            file.write(', '.join(s.name for s in program.structs))
+
+        return [path]
+
+    return Generator(generate_project=generate_project)
+
+
+def get_legacy_generator(language):
+    def generate_project(program, out_directory):
+        with open(os.path.join(out_directory, f'{program.name}.txt'), 'w') as file:
+            file.write('legacy')
+
+    return Generator(generate_project=generate_project)
+
+
+def get_broken_generator(language):
+    return Generator(generate_project=lambda program, out_directory: 'out.txt')
+
+
+class TestGeneratorRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = dict(generators._registry)
+        self.entry_points = [
+            EntryPoint('Plain', lambda: get_generator),
+            EntryPoint('python', lambda: get_generator)
+        ]
+
+        patcher = mock.patch.object(generators, '_iter_entry_points', side_effect=lambda: iter(self.entry_points))
+        self.iter_entry_points = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        generators._plugins_loaded = False
+
+    def tearDown(self):
+        generators._registry.clear()
+        generators._registry.update(self.registry)
+        generators._plugin_entry_points.clear()
+        generators._plugins_loaded = False
+
+    def test_builtin_language(self):
+        generator = generators.factory.from_language('Python')
+
+        self.assertTrue(hasattr(generator, 'generate_project'), 'Generator should be returned')
+        self.assertFalse(self.iter_entry_points.called, 'Plugins should not be loaded for built in languages')
+
+    def test_builtin_aliases(self):
+        for language in generators.languages():
+            with self.subTest(language=language):
+                generator = generators.factory.from_language(language.upper())
+
+                self.assertTrue(hasattr(generator, 'generate_project'), 'Every listed language should have a generator')
+
+    def test_plugin_language(self):
+        self.assertTrue(generators.is_valid_language('plain'), 'Plugin language should be valid')
+        self.assertIn('plain', generators.languages(), 'Plugin language should be listed')
+        self.assertEqual(self.iter_entry_points.call_count, 1, 'Plugins should only be loaded once')
+
+        with tempfile.TemporaryDirectory() as outdir:
+            wick.generate_project('struct A { int a; };', 'plain', outdir, 'plain.h')
+
+            with open(os.path.join(outdir, 'plain.txt')) as file:
+                self.assertEqual(file.read(), 'A', 'Plugin generator should be used')
+
+    def test_plugin_cannot_replace_builtin(self):
+        generators.languages()
+        generator = generators.factory.from_language('python')
+
+        self.assertNotIsInstance(generator, Generator, 'Built in generator should be used')
+
+    def test_plugin_fingerprint(self):
+        builtin = generators.fingerprint('python')
+
+        self.entry_points.append(DistEntryPoint('versioned', lambda: get_generator, Distribution('wick-versioned', '1.0')))
+        versioned = generators.fingerprint('versioned')
+
+        self.assertEqual(builtin, generators.fingerprint(), 'Built in languages should use the generator fingerprint')
+        self.assertNotEqual(generators.fingerprint('plain'), builtin, 'Plugin code should be part of the fingerprint')
+
+        self.entry_points[-1] = DistEntryPoint('versioned', lambda: get_generator, Distribution('wick-versioned', '1.1'))
+        generators._registry.pop('versioned')
+        generators._plugin_entry_points.clear()
+        generators._plugins_loaded = False
+
+        self.assertNotEqual(generators.fingerprint('versioned'), versioned, 'Plugin upgrades should change the fingerprint')
+
+    def test_plugin_without_outputs(self):
+        self.entry_points.append(EntryPoint('legacy', lambda: get_legacy_generator))
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'legacy.h')
+            with open(source, 'w') as file:
+                file.write('struct A { int a; };')
+
+            outdir = os.path.join(directory, 'out')
+            wick.generate_projects([source], 'legacy', outdir, cache=True)
+
+            with open(os.path.join(outdir, 'legacy.txt')) as file:
+                self.assertEqual(file.read(), 'legacy', 'Plugin output should be written')
+
+            with mock.patch.object(wick, 'generate_sources', wraps=wick.generate_sources) as generate:
+                wick.generate_projects([source], 'legacy', outdir, cache=True)
+
+            self.assertTrue(generate.called, 'Sources without reported outputs should not be cached')
+
+    def test_plugin_invalid_outputs(self):
+        self.entry_points.append(EntryPoint('broken', lambda: get_broken_generator))
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'broken.h')
+            with open(source, 'w') as file:
+                file.write('struct A { int a; };')
+
+            with self.assertRaisesRegex(TypeError, 'broken'):
+                wick.generate_projects([source], 'broken', directory)
+
+    def test_unknown_language(self):
+        self.assertFalse(generators.is_valid_language('cobol'), 'Unknown language should not be valid')
+
+
+class TestBytecodeCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+        patcher = mock.patch.dict(os.environ, {'WICK_CACHE_DIR': self.directory.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        from wick.generators import python
+
+        common.get_bytecode_cache.cache_clear()
+        python.get_environment.cache_clear()
+        self.addCleanup(common.get_bytecode_cache.cache_clear)
+        self.addCleanup(python.get_environment.cache_clear)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_cache_directory(self):
+        self.assertEqual(common.cache_directory(), self.directory.name, 'WICK_CACHE_DIR should be used')
+
+    def test_templates_are_cached(self):
+        from jinja2 import Environment, FileSystemLoader
+
+        from wick.generators import python
+
+        def environment():
+            env = Environment(
+                loader=FileSystemLoader(os.path.join(os.path.dirname(python.__file__), 'templates')),
+                bytecode_cache=common.get_bytecode_cache()
+            )
+            env.filters = python.get_environment().filters
+
+            return env
+
+        environment().get_template('main.jinja2')
+        self.assertTrue(os.listdir(os.path.join(self.directory.name, 'jinja2')), 'Compiled template should be stored')
+
+        env = environment()
+        with mock.patch.object(env, 'compile', side_effect=AssertionError('Template should not be compiled')):
+            env.get_template('main.jinja2')
+
+    def test_shared_environment(self):
+        from wick.generators import python
+
+        self.assertIs(python.get_environment(), python.get_environment(), 'Environment should be shared')
+
+
+class TestWriteFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'out.txt')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self):
+        with open(self.path) as file:
+            return file.read()
+
+    def test_chunks(self):
+        common.write_file(self.path, (str(i) for i in range(100)))
+
+        self.assertEqual(self.read(), ''.join(str(i) for i in range(100)), 'Chunks should be joined')
+        self.assertEqual(os.listdir(self.directory.name), ['out.txt'], 'Temporary file should be removed')
+
+    def test_unchanged(self):
+        common.write_file(self.path, 'abc')
+        os.utime(self.path, ns=(0, 0))
+
+        common.write_file(self.path, ['a', 'bc'])
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0, 'Unchanged file should not be rewritten')
+
+        common.write_file(self.path, ['a', 'bc', 'd'])
+        self.assertEqual(self.read(), 'abcd', 'Longer contents should be written')
+
+        common.write_file(self.path, ['ab'])
+        self.assertEqual(self.read(), 'ab', 'Shorter contents should be written')
+        self.assertEqual(os.listdir(self.directory.name), ['out.txt'], 'Temporary file should be removed')
+
+    def test_error(self):
+        def chunks():
+            yield 'partial'
+            raise ValueError('Render failed')
+
+        common.write_file(self.path, 'abc')
+
+        with self.assertRaises(ValueError):
+            common.write_file(self.path, chunks())
+
+        self.assertEqual(self.read(), 'abc', 'Existing file should be kept')
+        self.assertEqual(os.listdir(self.directory.name), ['out.txt'], 'Temporary file should be removed')
+
+    def test_undecodable(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'\xff\xfe garbage')
+
+        common.write_file(self.path, 'abc')
+        self.assertEqual(self.read(), 'abc', 'Undecodable files should be overwritten')
+
+    def test_markdown_chunks(self):
+        from wick.common import Program
+        from wick.generators.markdown import document
+        from wick.parser.parser import parse
+
+        program = Program('test.h', parse('struct A { int a; char b[4]; };\nstruct B { double c; };'))
+
+        self.assertEqual(
+            ''.join(document.generate_chunks(program)),
+            document.generate_source(program),
+            'Chunks should match the whole document'
+        )
+
+
+class TestOutputSink(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_flush(self):
+        paths = [os.path.join(self.directory.name, f'{i}.txt') for i in range(20)]
+
+        sink = generators.OutputSink()
+        for i, path in enumerate(paths):
+            sink.add(path, [str(i)] * i)
+
+        self.assertEqual(sink.flush(), paths, 'Paths should be returned in order')
+        self.assertEqual(sink.flush(), [], 'Flushed files should not be written again')
+
+        for i, path in enumerate(paths):
+            with open(path) as file:
+                self.assertEqual(file.read(), str(i) * i, 'File should be written')
+
+    def test_error(self):
+        def chunks():
+            yield 'partial'
+            raise ValueError('Render failed')
+
+        good = os.path.join(self.directory.name, 'good.txt')
+        bad = os.path.join(self.directory.name, 'bad.txt')
+
+        sink = generators.OutputSink()
+        sink.add(bad, chunks())
+        sink.add(good, 'good')
+
+        with self.assertRaises(ValueError):
+            sink.flush()
+
+        self.assertEqual(os.listdir(self.directory.name), ['good.txt'], 'Only the good file should be written')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
 
+import threads
+
 from wick.parser.lexer import Lexer, LexError, new_lexer
 
 
@@ -218,6 +220,59 @@ struct foo {
         token = lexer.lex()
         self.assertIsNone(token, 'Value should be None')
 
+    def test_ranges(self):
+        program = """/* first
+ * second */
+struct foo {
+\tint x;
+};"""
+        lexer = new_lexer(program)
+
+        expected = [
+            ('/* first\n * second */', (0, 0), (1, 12)),
+            ('struct', (2, 0), (2, 6)),
+            ('foo', (2, 7), (2, 10)),
+            ('{', (2, 11), (2, 12)),
+            ('int', (3, 1), (3, 4)),
+            ('x', (3, 5), (3, 6)),
+            (';', (3, 6), (3, 7)),
+            ('}', (4, 0), (4, 1)),
+            (';', (4, 1), (4, 2))
+        ]
+
+        for value, start, end in expected:
+            token = lexer.lex()
+            self.assertEqual(token.value, value, f'Value should be "{value}"')
+            self.assertEqual(tuple(token.range.start), start, f'Start of "{value}" should be {start}')
+            self.assertEqual(tuple(token.range.end), end, f'End of "{value}" should be {end}')
+
+        self.assertIsNone(lexer.lex(), 'Value should be None')
+
+    def test_concurrent_lexers(self):
+        def source(index):
+            members = '\n'.join(f'{"    " * (index % 3)}int m{j};' for j in range(index % 7 + 1))
+            return f'{chr(10) * (index % 5)}// Struct {index}\nstruct s{index} {{\n{members}\n}};\n'
+
+        def lex(program):
+            lexer = new_lexer(program)
+            tokens = []
+
+            while True:
+                token = lexer.lex()
+
+                if not token:
+                    return tokens
+
+                tokens.append((token.type, token.value, tuple(token.range.start), tuple(token.range.end)))
+
+        programs = [source(i) for i in range(400)]
+        expected = [lex(p) for p in programs]
+
+        actual = threads.map_concurrently(lex, programs)
+
+        for e, a in zip(expected, actual):
+            self.assertEqual(e, a, 'Concurrent results should match sequential results')
+
 
 if __name__ == '__main__':
     unittest.main()
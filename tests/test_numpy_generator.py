@@ -0,0 +1,99 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+import temporary_cache
+
+import wick
+
+try:
+    import numpy
+
+except ImportError:
+    numpy = None
+
+
+def setUpModule():
+    temporary_cache.start()
+
+
+def tearDownModule():
+    temporary_cache.stop()
+
+
+source_text = """
+struct Record {
+    char name[16];
+    unsigned char id;
+    short values[3];
+    double weight;
+};
+"""
+
+
+class TestNumpyGenerator(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.outdir = self.directory.name
+
+        wick.generate_project(source_text, 'numpy', self.outdir, 'records.h')
+
+    def tearDown(self):
+        for name in ['records', 'records_numpy', 'test_records_numpy']:
+            sys.modules.pop(name, None)
+
+        self.directory.cleanup()
+
+    def load_module(self, name, path):
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+
+        return module
+
+    def test_files(self):
+        self.assertTrue(os.path.exists(os.path.join(self.outdir, 'records.py')), 'Python module should be generated')
+        self.assertTrue(os.path.exists(os.path.join(self.outdir, 'records_numpy.py')), 'Numpy module should be generated')
+        self.assertTrue(os.path.exists(os.path.join(self.outdir, 'tests', 'test_records_numpy.py')), 'Numpy tests should be generated')
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_dtype(self):
+        records = self.load_module('records', os.path.join(self.outdir, 'records.py'))
+        records_numpy = self.load_module('records_numpy', os.path.join(self.outdir, 'records_numpy.py'))
+        dtype = records_numpy.Record.dtype
+
+        self.assertEqual(dtype.itemsize, records.Record.size, 'Sizes should be equal')
+        self.assertEqual(dtype.fields['weight'][1], 23, 'Weight offset should be 23')
+        self.assertEqual(dtype.fields['values'][0].shape, (3,), 'Values should be a subarray')
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_big_endian(self):
+        wick.generate_project(source_text, 'numpy', self.outdir, 'records.h', byte_order='big')
+
+        self.load_module('records', os.path.join(self.outdir, 'records.py'))
+        records_numpy = self.load_module('records_numpy', os.path.join(self.outdir, 'records_numpy.py'))
+        dtype = records_numpy.Record.dtype
+
+        self.assertEqual(dtype.fields['weight'][0].byteorder, '>', 'Weight should be big endian')
+        self.assertEqual(dtype.fields['values'][0].base.byteorder, '>', 'Values should be big endian')
+        self.assertEqual(dtype.fields['id'][0].byteorder, '|', 'Bytes should have no byte order')
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_generated_tests(self):
+        self.load_module('records', os.path.join(self.outdir, 'records.py'))
+        self.load_module('records_numpy', os.path.join(self.outdir, 'records_numpy.py'))
+        test_module = self.load_module('test_records_numpy', os.path.join(self.outdir, 'tests', 'test_records_numpy.py'))
+
+        suite = unittest.defaultTestLoader.loadTestsFromModule(test_module)
+        result = unittest.TestResult()
+        suite.run(result)
+
+        self.assertTrue(result.testsRun > 0, 'Generated tests should run')
+        self.assertTrue(result.wasSuccessful(), 'Generated tests should pass')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
 
+import threads
+
 from wick.parser.common import Range
 from wick.parser.parser import parse
 
@@ -454,12 +456,88 @@ typedef struct {
         self.assertIsNotNone(symbol.dimension, 'Dimension should not be None')
         self.assertEqual(symbol.dimension.value, '32', 'Dimension should be "32"')
 
+    def test_struct_members(self):
+        source_text = """
+struct A { int a; };
+typedef struct B { char b; } C;
+typedef struct { char d; } D;
+struct E {
+    struct A a;
+    C c[2];
+    B b;
+    D d;
+};"""
+        parse_tree = parse(source_text)
+
+        self.assertFalse(parse_tree.errors, 'Errors during parsing')
+
+        struct_symbol = self.get_symbol(parse_tree.scope, 'E')
+        members = {s.value: s for s in struct_symbol.inner_scope.definitions.values() if s.arity == 'name' and not s.reserved}
+        self.assertEqual(list(members), ['a', 'c', 'b', 'd'], 'Struct members should be defined')
+
+        self.assertEqual(members['a'].type.value, 'A', 'Type should be "A"')
+        self.assertEqual(members['c'].type.value, 'B', 'Aliases should resolve to the struct')
+        self.assertEqual(members['c'].dimension.value, '2', 'Dimension should be "2"')
+        self.assertEqual(members['b'].type.value, 'B', 'Type should be "B"')
+        self.assertEqual(members['d'].type.value, 'D', 'Type should be "D"')
+        self.assertIs(members['d'].type.inner_scope, self.get_symbol(parse_tree.scope, 'D').inner_scope, 'Type should be the struct definition')
+
+    def test_unknown_struct_members(self):
+        source_text = """
+struct A;
+struct B {
+    struct A a;
+    struct C c;
+    struct B b;
+    int i;
+};"""
+        parse_tree = parse(source_text)
+
+        messages = [e.message for e in parse_tree.errors]
+        self.assertEqual(messages, ['Incomplete struct: A', 'Unknown struct: C', 'Incomplete struct: B'], 'Undefined structs should be errors')
+
+        struct_symbol = self.get_symbol(parse_tree.scope, 'B')
+        self.assertIsNotNone(self.get_symbol(struct_symbol.inner_scope, 'i'), 'Members after errors should be parsed')
+
     def test_dont_parse_variable_declarations_outside_a_struct(self):
         source_text = """float d;"""
         parse_tree = parse(source_text)
 
         self.assertEqual(len(parse_tree.errors), 3, 'Three errors should be present')
 
+    def test_comments_are_not_shared_between_parses(self):
+        source_text = """
+// Description of A
+struct A {
+    int a;
+};"""
+
+        parse(source_text)
+        parse_tree = parse(source_text)
+
+        self.assertEqual(len(parse_tree.comments), 1, 'Only comments from the current parse should be present')
+
+    def test_concurrent_parses(self):
+        def source(index):
+            members = '\n'.join(f'    // Member {j}\n    int m{j};' for j in range(index % 5 + 1))
+            return f'// Struct {index}\nstruct s{index} {{\n{members}\n}};\n'
+
+        def summarize(source_text):
+            parse_tree = parse(source_text)
+            struct_symbol = [s for s in parse_tree.scope.definitions.values() if hasattr(s, 'inner_scope')][0]
+            members = [(s.value, s.type.value, tuple(s.range.start)) for s in struct_symbol.inner_scope.definitions.values() if s.arity == 'name']
+            comments = [c.value for c in parse_tree.comments]
+
+            return struct_symbol.value, members, comments, len(parse_tree.errors)
+
+        sources = [source(i) for i in range(200)]
+        expected = [summarize(s) for s in sources]
+
+        actual = threads.map_concurrently(summarize, sources)
+
+        for e, a in zip(expected, actual):
+            self.assertEqual(e, a, 'Concurrent results should match sequential results')
+
 
 if __name__ == '__main__':
     unittest.main()
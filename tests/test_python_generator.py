@@ -0,0 +1,368 @@
+import ctypes
+import importlib.util
+import io
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+from unittest import mock
+
+import temporary_cache
+
+import wick
+
+
+def setUpModule():
+    temporary_cache.start()
+
+
+def tearDownModule():
+    temporary_cache.stop()
+
+
+source_text = """
+/* Simple Record */
+struct Record {
+    // Record name
+    char name[16];
+
+    // Record id.
+    unsigned char id;
+    short values[3];
+    char tag;
+    double weight;
+};
+
+typedef struct {
+    int a, b;
+    unsigned long long big;
+    float f[2];
+} Pair;
+"""
+
+
+class GeneratorTestCase(unittest.TestCase):
+    """Generates Python projects into a temporary directory and imports them."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.outdir = self.directory.name
+        self.module_names = []
+
+    def tearDown(self):
+        for name in self.module_names:
+            sys.modules.pop(name, None)
+
+        self.directory.cleanup()
+
+    def load_module(self, name, path):
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        self.module_names.append(name)
+        spec.loader.exec_module(module)
+
+        return module
+
+    def generate(self, source=source_text, name='records', **options):
+        wick.generate_project(source, 'python', self.outdir, f'{name}.h', **options)
+
+        return self.load_module(name, os.path.join(self.outdir, f'{name}.py'))
+
+    def assertGeneratedTestsPass(self, name='records'):
+        test_module = self.load_module(f'test_{name}', os.path.join(self.outdir, 'tests', f'test_{name}.py'))
+
+        result = unittest.TestResult()
+        unittest.defaultTestLoader.loadTestsFromModule(test_module).run(result)
+
+        self.assertTrue(result.testsRun > 0, 'Generated tests should run')
+        self.assertTrue(result.wasSuccessful(), 'Generated tests should pass')
+
+
+class TestPythonGenerator(GeneratorTestCase):
+    def setUp(self):
+        super().setUp()
+        self.module = self.generate()
+
+    def test_format(self):
+        Record = self.module.Record
+
+        self.assertEqual(Record.format, '<16sB3hcd', 'Format should be "<16sB3hcd"')
+        self.assertEqual(Record.size, struct.calcsize(Record.format), 'Size should match format')
+
+    def test_read_write(self):
+        Record = self.module.Record
+        buff = io.BytesIO()
+
+        expected = Record(b'name', 1, 2, 3, 4, b'x', 0.5)
+        Record.write(buff, expected)
+        buff.seek(0)
+        actual = Record.read(buff)
+
+        self.assertEqual(actual.name, 'name', 'Name should be decoded')
+        self.assertEqual(actual.id, 1, 'Id should be 1')
+        self.assertEqual(actual.values, (2, 3, 4), 'Values should be (2, 3, 4)')
+        self.assertEqual(actual.tag, b'x', 'Tag should be b"x"')
+        self.assertEqual(actual.weight, 0.5, 'Weight should be 0.5')
+        self.assertEqual(buff.read(), b'', 'Buffer should be fully consumed')
+
+    def test_read_write_many(self):
+        Pair = self.module.Pair
+        buff = io.BytesIO()
+
+        expected = [Pair(i, -i, i * 2, 0.5, 1.5) for i in range(10000)]
+        Pair.write_many(buff, expected)
+        self.assertEqual(len(buff.getvalue()), Pair.size * len(expected), 'All records should be written')
+
+        buff.seek(0)
+        actual = Pair.read_many(buff)
+        self.assertEqual([p.a for p in actual], [p.a for p in expected], 'All records should be read')
+
+        buff.seek(0)
+        actual = list(Pair.iter_read(buff, chunk_size=7))
+        self.assertEqual([p.b for p in actual], [p.b for p in expected], 'All records should be read')
+
+        buff.seek(0)
+        actual = Pair.read_many(buff, 5)
+        self.assertEqual([p.big for p in actual], [0, 2, 4, 6, 8], 'Only the given count should be read')
+        self.assertEqual(buff.tell(), Pair.size * 5, 'Only the given count should be consumed')
+
+    def test_buffer(self):
+        Pair = self.module.Pair
+        path = os.path.join(self.outdir, 'pairs.bin')
+
+        with open(path, 'wb') as file:
+            Pair.write_many(file, [Pair(i, -i, i * 2, 0.5, 1.5) for i in range(10)])
+
+        with open(path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                actual = Pair.from_buffer(buffer, Pair.size * 3)
+
+        self.assertEqual(actual.a, 3, 'A should be 3')
+        self.assertEqual(actual.b, -3, 'B should be -3')
+
+        buffer = bytearray(Pair.size * 2)
+        Pair.into_buffer(memoryview(buffer), Pair.size, actual)
+        self.assertEqual(buffer[:Pair.size], bytes(Pair.size), 'Buffer before offset should be untouched')
+        self.assertEqual(Pair.from_buffer(bytes(buffer), Pair.size).big, 6, 'Big should be 6')
+
+    def test_views(self):
+        Pair = self.module.Pair
+        PairViews = self.module.PairViews
+        path = os.path.join(self.outdir, 'pairs.bin')
+
+        with open(path, 'wb') as file:
+            Pair.write_many(file, [Pair(i, -i, i * 2, 0.5, 1.5) for i in range(10)])
+
+        with open(path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                views = PairViews(buffer, Pair.size)
+                self.assertEqual(len(views), 9, 'Records before offset should be skipped')
+                self.assertEqual(views[0].a, 1, 'A should be 1')
+                self.assertEqual(views[-1].big, 18, 'Big should be 18')
+                self.assertEqual(views[2].f, (0.5, 1.5), 'F should be (0.5, 1.5)')
+                self.assertEqual([v.b for v in views[::4]], [-1, -5, -9], 'Slices should return views')
+                self.assertEqual(views[3].materialize().a, 4, 'Materialized record should match view')
+
+                with self.assertRaises(IndexError):
+                    views[9]
+
+                del views
+
+    def test_read_columns(self):
+        Record = self.module.Record
+        buff = io.BytesIO()
+
+        expected = [Record(b'r%d' % i, i % 256, i, -i, 2 * i, b'x', i / 4) for i in range(1000)]
+        Record.write_many(buff, expected)
+        buff.write(b'partial')
+        buff.seek(0)
+
+        actual = Record.read_columns(buff)
+        self.assertEqual(actual['name'], [r.name for r in expected], 'Names should be decoded')
+        self.assertEqual(actual['id'].tolist(), [r.id for r in expected], 'Ids should match')
+        self.assertEqual(actual['values'].tolist(), [v for r in expected for v in r.values], 'Values should be flattened')
+        self.assertEqual(actual['tag'], [b'x'] * 1000, 'Tags should be bytes')
+        self.assertEqual(sum(actual['weight']), sum(r.weight for r in expected), 'Weights should match')
+
+        actual = Record.read_columns(memoryview(buff.getvalue())[Record.size * 990:])
+        self.assertEqual(actual['values'][::3].tolist(), list(range(990, 1000)), 'Buffers should be supported')
+
+    def test_read_columns_mmap(self):
+        Pair = self.module.Pair
+        path = os.path.join(self.outdir, 'pairs.bin')
+
+        with open(path, 'wb') as file:
+            Pair.write_many(file, [Pair(i, -i, i * 2, 0.5, 1.5) for i in range(5)])
+
+        with open(path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                first = Pair.read_columns(buffer)
+                second = Pair.read_columns(buffer)
+
+                self.assertEqual(buffer.tell(), 0, 'Map position should not move')
+
+        self.assertEqual(first['a'].tolist(), [0, 1, 2, 3, 4], 'A should be read from the map')
+        self.assertEqual(second['a'].tolist(), first['a'].tolist(), 'Map should be readable again')
+
+    def test_generated_tests(self):
+        self.assertGeneratedTestsPass()
+
+
+class TestPythonLayout(GeneratorTestCase):
+    def test_natural(self):
+        module = self.generate(layout='natural')
+
+        class Record(ctypes.Structure):
+            _fields_ = [
+                ('name', ctypes.c_char * 16),
+                ('id', ctypes.c_ubyte),
+                ('values', ctypes.c_short * 3),
+                ('tag', ctypes.c_char),
+                ('weight', ctypes.c_double)
+            ]
+
+        expected = Record(b'name', 1, (2, 3, 4), b'x', 0.5)
+        actual = module.Record.from_buffer(bytes(expected))
+
+        self.assertEqual(module.Record.size, ctypes.sizeof(Record), 'Size should match C')
+        self.assertEqual(actual.values, (2, 3, 4), 'Values should be read after padding')
+        self.assertEqual(actual.weight, 0.5, 'Weight should be read after padding')
+        self.assertEqual(module.RecordViews(bytes(expected))[0].weight, 0.5, 'Views should use aligned offsets')
+        self.assertEqual(module.Record.read_columns(bytes(expected) * 2)['weight'].tolist(), [0.5, 0.5], 'Columns should use aligned offsets')
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            wick.generate_project(source_text, 'python', self.outdir, 'records.h', layout='aligned')
+
+
+class TestPythonByteOrder(GeneratorTestCase):
+    def test_big(self):
+        module = self.generate(byte_order='big')
+        data = struct.pack('>16sB3hcd', b'name', 1, 2, -3, 4, b'x', 0.5)
+
+        record = module.Record.from_buffer(data)
+        self.assertEqual((record.id, record.values, record.weight), (1, (2, -3, 4), 0.5), 'Values should be read big endian')
+
+        buff = io.BytesIO()
+        module.Record.write(buff, record)
+        self.assertEqual(buff.getvalue(), data, 'Values should be written big endian')
+
+        self.assertEqual(module.RecordViews(data)[0].values, (2, -3, 4), 'Views should read big endian')
+        self.assertEqual(module.Record.read_columns(data * 2)['values'].tolist(), [2, -3, 4] * 2, 'Columns should read big endian')
+
+    def test_native(self):
+        module = self.generate(byte_order='native')
+        data = struct.pack('=16sB3hcd', b'name', 1, 2, -3, 4, b'x', 0.5)
+
+        self.assertEqual(module.Record.size, len(data), 'Native byte order should use standard sizes')
+        self.assertEqual(module.Record.from_buffer(data).weight, 0.5, 'Values should be read in host byte order')
+        self.assertEqual(module.Record.read_columns(data)['values'].tolist(), [2, -3, 4], 'Columns should read host byte order')
+
+    def test_generated_tests(self):
+        self.generate(byte_order='big')
+        self.assertGeneratedTestsPass()
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            wick.generate_project(source_text, 'python', self.outdir, 'records.h', byte_order='network')
+
+
+nested_source_text = """
+typedef struct {
+    short x;
+    char tag;
+} Point;
+
+struct Line {
+    unsigned char id;
+    Point points[2];
+    char name[5];
+};
+
+struct Shape {
+    struct Line line;
+    double area;
+    Point center;
+};
+"""
+
+
+class TestPythonNestedStructs(GeneratorTestCase):
+    def setUp(self):
+        super().setUp()
+        self.module = self.generate(nested_source_text, 'shapes', layout='natural')
+
+    def test_read_write(self):
+        Shape = self.module.Shape
+        Line = self.module.Line
+        buff = io.BytesIO()
+
+        expected = Shape(7, 1, b'a', 2, b'b', 'line', 0.5, 3, b'c')
+        self.assertEqual(Shape.format, '<Bxhcxhcx5sxdhc5x', 'Format should cover every field')
+
+        Shape.write(buff, expected)
+        self.assertEqual(len(buff.getvalue()), 32, 'Record should be padded')
+        buff.seek(0)
+
+        with mock.patch.object(Line, 'from_buffer', side_effect=AssertionError('Line should not be read')):
+            actual = Shape.read(buff)
+
+        self.assertIsInstance(actual.line, Line, 'Line should be a Line')
+        self.assertEqual(actual.line.id, 7, 'Id should be 7')
+        self.assertEqual([p.x for p in actual.line.points], [1, 2], 'Points should be read')
+        self.assertEqual(actual.line.name, 'line', 'Name should be decoded')
+        self.assertEqual(actual.area, 0.5, 'Area should be 0.5')
+        self.assertEqual(actual.center.tag, b'c', 'Tag should be b"c"')
+
+        view = self.module.ShapeViews(buff.getvalue())[0]
+        self.assertEqual(view.line.points[1].tag, b'b', 'Views should be nested')
+
+        columns = Shape.read_columns(buff.getvalue())
+        self.assertEqual(columns['line_points_1_x'].tolist(), [2], 'Columns should be flattened')
+
+    def test_generated_tests(self):
+        self.assertGeneratedTestsPass('shapes')
+
+
+class TestPythonStringModes(GeneratorTestCase):
+    def test_raw(self):
+        Record = self.generate(strings='raw').Record
+        buff = io.BytesIO()
+
+        Record.write(buff, Record(b'name', 1, 2, 3, 4, b'x', 0.5))
+        buff.seek(0)
+        actual = Record.read(buff)
+
+        self.assertEqual(actual.name, b'name'.ljust(16, b'\x00'), 'Name should not be decoded')
+        self.assertEqual(Record.read_columns(buff.getvalue())['name'], [actual.name], 'Name column should not be decoded')
+
+    def test_lazy(self):
+        Record = self.generate(strings='lazy').Record
+        buff = io.BytesIO()
+
+        Record.write(buff, Record('name', 1, 2, 3, 4, b'x', 0.5))
+        buff.seek(0)
+        actual = Record.read(buff)
+
+        self.assertEqual(actual._name, b'name'.ljust(16, b'\x00'), 'Name should not be decoded on read')
+        self.assertEqual(actual.name, 'name', 'Name should be decoded on access')
+        self.assertEqual(actual._name, 'name', 'Decoded name should be kept')
+
+        actual.name = b'other'
+        buff = io.BytesIO()
+        Record.write(buff, actual)
+        buff.seek(0)
+
+        self.assertEqual(Record.read(buff).name, 'other', 'Bytes should be written as is')
+
+    def test_invalid(self):
+        with self.assertRaises(SystemExit):
+            wick.generate_project(source_text, 'python', self.outdir, 'records.h', strings='unicode')
+
+
+if __name__ == '__main__':
+    unittest.main()
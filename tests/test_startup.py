@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def imported_modules(code):
+    """Runs code in a fresh interpreter and returns the imported module names."""
+
+    result = subprocess.run(
+        [sys.executable, '-c', f'{code}\nimport sys\nprint("\\n".join(sys.modules))'],
+        cwd=root,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+
+    return set(result.stdout.split())
+
+
+class TestStartup(unittest.TestCase):
+    def test_import_cli(self):
+        modules = imported_modules('import wick.cli')
+
+        self.assertNotIn('jinja2', modules, 'Jinja2 should not be imported')
+        self.assertNotIn('wick.parser', modules, 'Parser should not be imported')
+        self.assertNotIn('concurrent.futures', modules, 'Process pool should not be imported')
+        self.assertEqual({m for m in modules if m.startswith('wick.generators.')}, {'wick.generators.common'}, 'No generators should be imported')
+
+    def test_markdown_generator(self):
+        modules = imported_modules('import wick\nwick.generators.factory.from_language("markdown")')
+
+        self.assertIn('wick.generators.markdown', modules, 'Markdown generator should be imported')
+        self.assertNotIn('wick.generators.python', modules, 'Other generators should not be imported')
+        self.assertNotIn('jinja2', modules, 'Jinja2 should not be imported')
+
+    def test_python_generator(self):
+        modules = imported_modules('import wick\nwick.generators.factory.from_language("python")')
+
+        self.assertIn('wick.generators.python', modules, 'Python generator should be imported')
+        self.assertNotIn('wick.generators.csharp', modules, 'Other generators should not be imported')
+        self.assertNotIn('importlib.metadata', modules, 'Plugins should not be scanned for built in languages')
+
+
+if __name__ == '__main__':
+    unittest.main()
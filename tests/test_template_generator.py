@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+import wick
+
+from wick import cli
+from wick.generators import template
+
+
+source_text = """
+struct Record {
+    char name[16];
+    unsigned char id;
+};
+"""
+
+template_text = """{% for struct in program.structs -%}
+{{ struct.name|shout }}:{% for member in struct.members %} {{ member.name }}{% endfor %}
+{% endfor %}"""
+
+filters_text = """filters = {
+    'shout': lambda text: text.upper()
+}
+"""
+
+
+context_filters_text = """from jinja2 import contextfilter
+
+filters = {
+    'shout': contextfilter(lambda context, text: text.upper())
+}
+"""
+
+
+class TestTemplateGenerator(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.outdir = os.path.join(self.root, 'out')
+
+        patcher = mock.patch.dict(os.environ, {'WICK_CACHE_DIR': os.path.join(self.root, 'cache')})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.filters = os.path.join(self.root, 'filters.py')
+        with open(self.filters, 'w') as file:
+            file.write(filters_text)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def generate(self):
+        wick.generate_project_from_template(source_text, self.outdir, 'records.h', template_text, self.filters)
+
+        with open(os.path.join(self.outdir, 'records')) as file:
+            return file.read()
+
+    def test_generate(self):
+        self.assertEqual(self.generate(), 'RECORD: name id\n', 'Template should be rendered with filters')
+
+    def test_compiled_template(self):
+        path = template.compile_template(template_text, self.filters)
+        self.assertTrue(os.path.exists(path), 'Compiled template should be stored')
+
+        with mock.patch('jinja2.Environment.compile', side_effect=AssertionError('Template should not be compiled')):
+            self.assertEqual(self.generate(), 'RECORD: name id\n', 'Compiled template should be rendered')
+
+    def test_template_changes(self):
+        template.compile_template(template_text, self.filters)
+        env = template.create_environment(self.filters)
+
+        self.assertNotEqual(
+            template.compiled_template_path(env, template_text),
+            template.compiled_template_path(env, template_text + '\n'),
+            'Changed templates should not use the same compiled code'
+        )
+
+    def test_filter_changes(self):
+        template.compile_template(template_text, self.filters)
+
+        with open(self.filters, 'w') as file:
+            file.write(context_filters_text)
+
+        self.assertEqual(self.generate(), 'RECORD: name id\n', 'Changed filters should not use stale compiled code')
+
+    def test_cli_directory(self):
+        source = os.path.join(self.root, 'records.h')
+        template_path = os.path.join(self.root, 'records.jinja2')
+
+        with open(source, 'w') as file:
+            file.write(source_text)
+
+        with open(template_path, 'w') as file:
+            file.write(template_text)
+
+        with mock.patch('sys.argv', ['wick', 'template', source, template_path, self.filters, '-d', self.outdir]):
+            with self.assertRaises(SystemExit) as context:
+                cli.main()
+
+        self.assertEqual(context.exception.code, 0, 'Template should be generated')
+
+        with open(os.path.join(self.outdir, 'records')) as file:
+            self.assertEqual(file.read(), 'RECORD: name id\n', 'Output should be written to the directory')
+
+    def test_corrupt_cache(self):
+        path = template.compile_template(template_text, self.filters)
+
+        with open(path, 'wb') as file:
+            file.write(b'corrupt')
+
+        self.assertEqual(self.generate(), 'RECORD: name id\n', 'Corrupt compiled templates should be recompiled')
+
+
+if __name__ == '__main__':
+    unittest.main()
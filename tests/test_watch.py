@@ -0,0 +1,86 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import temporary_cache
+
+from wick.watch import Watcher
+
+
+def setUpModule():
+    temporary_cache.start()
+
+
+def tearDownModule():
+    temporary_cache.stop()
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.outdir = os.path.join(self.root, 'out')
+        self.sources = []
+
+        self.watcher = Watcher(lambda: self.sources, 'python', self.outdir, debounce=0)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_source(self, name, text):
+        path = os.path.join(self.root, name)
+
+        with open(path, 'w') as file:
+            file.write(text)
+
+        if path not in self.sources:
+            self.sources.append(path)
+
+        return path
+
+    def step(self):
+        output = io.StringIO()
+        errors = io.StringIO()
+
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+            changed = self.watcher.step()
+
+        return changed, errors.getvalue()
+
+    def test_step(self):
+        first = self.write_source('first.h', 'struct A {\n    int a;\n};\n')
+
+        changed, _ = self.step()
+        self.assertEqual(changed, [first], 'New sources should be generated')
+        self.assertTrue(os.path.exists(os.path.join(self.outdir, 'first.py')), 'Module should be generated')
+
+        changed, _ = self.step()
+        self.assertEqual(changed, [], 'Unchanged sources should be skipped')
+
+        second = self.write_source('second.h', 'struct B {\n    int b\n};\n')
+        changed, errors = self.step()
+        self.assertEqual(changed, [second], 'Only the new source should be generated')
+        self.assertTrue(errors.startswith(f'{second}:3:1: '), 'Errors should be reported')
+
+        self.write_source('second.h', 'struct B {\n    int b;\n};\n')
+        changed, errors = self.step()
+        self.assertEqual(changed, [second], 'Modified sources should be generated')
+        self.assertEqual(errors, '', 'Fixed sources should not report errors')
+
+    def test_removed_source(self):
+        first = self.write_source('first.h', 'struct A {\n    int a;\n};\n')
+        self.step()
+
+        os.remove(first)
+        changed, _ = self.step()
+        self.assertEqual(changed, [], 'Removed sources should be ignored')
+
+    def test_invalid_layout(self):
+        with self.assertRaises(ValueError):
+            Watcher(lambda: self.sources, 'python', self.outdir, layout='aligned')
+
+
+if __name__ == '__main__':
+    unittest.main()
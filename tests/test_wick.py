@@ -0,0 +1,185 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import warnings
+
+from unittest import mock
+
+import temporary_cache
+
+import wick
+
+from wick import cli, parser
+
+
+def setUpModule():
+    temporary_cache.start()
+
+
+def tearDownModule():
+    temporary_cache.stop()
+
+
+@contextlib.contextmanager
+def redirect_errors(errors):
+    """Redirects stderr to errors.
+
+    Warnings from compiling templates are ignored, so only wick's messages
+    are captured whether or not the templates were compiled before.
+    """
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+
+        with contextlib.redirect_stderr(errors):
+            yield
+
+
+first_source = """
+struct Record {
+    char name[16];
+    unsigned char id;
+    short values[3];
+};
+"""
+
+second_source = """
+typedef struct {
+    int a, b;
+    double weight;
+} Pair;
+"""
+
+
+class TestGenerateProjects(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+
+        os.makedirs(os.path.join(self.root, 'include', 'nested'))
+        self.sources = [
+            self.write_source(os.path.join('include', 'first.h'), first_source),
+            self.write_source(os.path.join('include', 'nested', 'second.h'), second_source)
+        ]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_source(self, name, text):
+        path = os.path.join(self.root, name)
+
+        with open(path, 'w') as file:
+            file.write(text)
+
+        return path
+
+    def read_tree(self, directory):
+        result = {}
+
+        for root, _, files in os.walk(directory):
+            for name in files:
+                path = os.path.join(root, name)
+
+                with open(path) as file:
+                    result[os.path.relpath(path, directory)] = file.read()
+
+        return result
+
+    def test_matches_single_projects(self):
+        for language in ['python', 'numpy', 'csharp', 'markdown']:
+            single_dir = os.path.join(self.root, 'single', language)
+            batch_dir = os.path.join(self.root, 'batch', language)
+
+            for source_file in self.sources:
+                with open(source_file) as file:
+                    wick.generate_project(file.read(), language, single_dir, source_file)
+
+            wick.generate_projects(self.sources, language, batch_dir)
+
+            expected = self.read_tree(single_dir)
+            self.assertTrue(expected, 'Files should be generated')
+            self.assertEqual(self.read_tree(batch_dir), expected, f'{language} output should be identical')
+
+    def test_jobs(self):
+        bad_source = self.write_source('bad.h', 'struct Bad {\n    int a\n};\n')
+        sources = [bad_source] + self.sources + [bad_source]
+
+        serial_errors = io.StringIO()
+        with redirect_errors(serial_errors):
+            wick.generate_projects(sources, 'python', os.path.join(self.root, 'serial'))
+
+        parallel_errors = io.StringIO()
+        with redirect_errors(parallel_errors):
+            wick.generate_projects(sources, 'python', os.path.join(self.root, 'parallel'), jobs=2)
+
+        expected = self.read_tree(os.path.join(self.root, 'serial'))
+        self.assertEqual(self.read_tree(os.path.join(self.root, 'parallel')), expected, 'Output should be identical')
+        self.assertTrue(serial_errors.getvalue().startswith(f'{bad_source}:3:1: '), 'Errors should include the location')
+        self.assertEqual(parallel_errors.getvalue(), serial_errors.getvalue(), 'Errors should be reported in source order')
+
+    def test_cache(self):
+        outdir = os.path.join(self.root, 'cached')
+        bad_source = self.write_source('bad.h', 'struct Bad {\n    int a\n};\n')
+        sources = self.sources + [bad_source]
+
+        def generate():
+            errors = io.StringIO()
+
+            with mock.patch.object(parser, 'parse', wraps=parser.parse) as parse:
+                with redirect_errors(errors):
+                    wick.generate_projects(sources, 'python', outdir, cache=True)
+
+            return sorted(os.path.basename(c.args[0]) for c in parse.call_args_list), errors.getvalue()
+
+        parsed, expected_errors = generate()
+        self.assertEqual(parsed, ['bad.h', 'first.h', 'second.h'], 'All sources should be parsed')
+        self.assertTrue(os.path.exists(os.path.join(outdir, '.wick-cache')), 'Cache file should be written')
+
+        module_path = os.path.join(outdir, 'first.py')
+        mtime = os.stat(module_path).st_mtime_ns
+
+        parsed, errors = generate()
+        self.assertEqual(parsed, [], 'Unchanged sources should be skipped')
+        self.assertEqual(errors, expected_errors, 'Errors should be reported for skipped sources')
+
+        with open(self.sources[0], 'a') as file:
+            file.write('\n')
+
+        with open(os.path.join(outdir, 'second.py'), 'a') as file:
+            file.write('# Edited\n')
+
+        parsed, _ = generate()
+        self.assertEqual(parsed, ['first.h', 'second.h'], 'Changed sources and outputs should be regenerated')
+        self.assertEqual(os.stat(module_path).st_mtime_ns, mtime, 'Identical output should not be rewritten')
+
+        with open(os.path.join(outdir, 'second.py')) as file:
+            self.assertNotIn('# Edited', file.read(), 'Edited output should be regenerated')
+
+    def test_expand_sources(self):
+        pattern = os.path.join(self.root, 'include', '**', '*.h')
+        sources = cli.expand_sources([self.sources[1], pattern, 'missing.h'])
+
+        self.assertEqual(sources[:2], [self.sources[1], self.sources[0]], 'Sources should be unique and in argument order')
+        self.assertEqual(sources[2], cli.resolve_path('missing.h'), 'Unmatched patterns should be kept')
+
+    def test_invalid_jobs(self):
+        for jobs in ['0', '-1', 'many']:
+            with mock.patch('sys.argv', ['wick', self.sources[0], 'python', f'--jobs={jobs}']):
+                with self.assertRaises(cli.DocoptExit):
+                    cli.main()
+
+    def test_invalid_layout(self):
+        errors = io.StringIO()
+
+        with mock.patch('sys.argv', ['wick', self.sources[0], 'python', '--layout=aligned']):
+            with redirect_errors(errors), self.assertRaises(SystemExit) as context:
+                cli.main()
+
+        self.assertEqual(context.exception.code, 1, 'Invalid layouts should fail')
+        self.assertEqual(errors.getvalue(), 'Unsupported layout: "aligned"\n', 'Invalid layouts should be reported')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,12 @@
 __version__ = '1.1.0'
 
 import os
+import sys
 
 from . import generators
-from . import parser
 
 
-def generate_project(source, language, outdir, uri):
+def generate_project(source, language, outdir, uri, layout='packed', byte_order='little', **options):
     """For the given C struct source code, generate source code to read and
     write that data in the given language. The resulting source code will be
     written to disk at the location specified by outdir.
@@ -19,13 +19,201 @@ def generate_project(source, language, outdir, uri):
         outdir: Target directory to write generated files.
 
         uri: Source text file URI.
+
+        layout: How struct members are aligned. "packed" has no padding,
+            "natural" aligns members like a C compiler and "pack(n)" limits
+            alignment to n bytes like #pragma pack(n).
+
+        byte_order: The byte order of multibyte values. "little", "big" or
+            "native" for the byte order of the machine running the generated
+            code.
+
+        options: Language specific generator options. The Python and NumPy
+            generators accept strings="decode"|"raw"|"lazy".
+
+    Raises:
+        ValueError: If layout or byte_order is not supported
+    """
+
+    check_layout(layout, byte_order)
+    generator = generators.factory.from_language(language, **options)
+    _generate_project(source, outdir, uri, generator, layout, byte_order)
+
+
+def generate_projects(sources, language, outdir, jobs=1, cache=False, layout='packed', byte_order='little', **options):
+    """For each of the given C struct source files, generate source code to
+    read and write that data in the given language. The resulting source code
+    will be written to disk at the location specified by outdir.
+
+    All sources share a single generator, so templates are loaded and compiled
+    once. Output is identical to calling generate_project for each source.
+
+    Args:
+        sources: Paths to C source files that only contain structs with simple
+            types.
+
+        language: Target language to generate code for.
+
+        outdir: Target directory to write generated files.
+
+        jobs: Number of worker processes. 1 generates everything in this
+            process, None uses one process per CPU. Parse errors are always
+            reported in source order.
+
+        cache: Keep a .wick-cache file in outdir and skip sources whose text,
+            language, options and generator are unchanged since the last run.
+
+        layout: How struct members are aligned: "packed", "natural" or
+            "pack(n)".
+
+        byte_order: The byte order of multibyte values: "little", "big" or
+            "native".
+
+        options: Language specific generator options.
+
+    Raises:
+        ValueError: If layout or byte_order is not supported
     """
 
-    generator = generators.factory.from_language(language)
-    _generate_project(source, outdir, uri, generator)
+    check_layout(layout, byte_order)
+    generator = generators.factory.from_language(language, **options)
+    os.makedirs(outdir, exist_ok=True)
 
+    # Sources with the same name write the same files, so they are always
+    # generated together and in order to get the same result as a serial run.
+    groups = {}
+    for source_file in sources:
+        name = os.path.basename(source_file).split('.')[0]
+        groups.setdefault(name, []).append(source_file)
+
+    errors = {}
+    keys = {}
+    stale_groups = []
+
+    if cache:
+        from .cache import Cache
+
+        cache = Cache(outdir, __version__, generators.fingerprint(language))
+
+        for group in groups.values():
+            for source_file in group:
+                with open(source_file) as file:
+                    keys[source_file] = cache.key(file.read(), language, {**options, 'layout': layout, 'byte_order': byte_order})
+
+                errors[source_file] = cache.get(source_file, keys[source_file])
+
+            if any(errors[source_file] is None for source_file in group):
+                stale_groups.append(group)
+
+    else:
+        stale_groups = list(groups.values())
+
+    if jobs == 1:
+        results = [generate_sources(group, language, outdir, generator, layout, byte_order, **options) for group in stale_groups]
+
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(generate_sources, group, language, outdir, layout=layout, byte_order=byte_order, **options) for group in stale_groups]
+            results = [future.result() for future in futures]
+
+    for result in results:
+        for source_file, (outputs, source_errors) in result.items():
+            errors[source_file] = source_errors
+
+            # Generators that don't report their outputs can't be cached
+            if cache and outputs is not None:
+                cache.set(source_file, keys[source_file], outputs, source_errors)
+
+    if cache:
+        cache.save()
+
+    for source_file in sources:
+        for error in errors[source_file]:
+            print(error, file=sys.stderr)
+
+
+_worker_generators = {}
+
+
+def generate_sources(sources, language, outdir, generator=None, layout='packed', byte_order='little', **options):
+    """Generates the given source files in order.
+
+    Nothing is printed, so callers decide how to report parse errors. This
+    also runs in worker processes for generate_projects.
+
+    Args:
+        sources: Paths to C source files that only contain structs with simple
+            types.
 
-def generate_project_from_template(source, outdir, uri, template, filters=None):
+        language: Target language to generate code for.
+
+        outdir: Target directory to write generated files.
+
+        generator: An optional generator for language to reuse. One is created
+            and kept for each language and options if not given.
+
+        layout: How struct members are aligned: "packed", "natural" or
+            "pack(n)".
+
+        byte_order: The byte order of multibyte values: "little", "big" or
+            "native".
+
+        options: Language specific generator options.
+
+    Returns:
+        A dict of source path to a tuple of generated paths and parse error
+        messages. Paths are None if the generator didn't return them.
+
+    Raises:
+        ValueError: If layout or byte_order is not supported
+
+        TypeError: If the generator doesn't return a list of paths
+    """
+
+    check_layout(layout, byte_order)
+
+    if generator is None:
+        key = (language, tuple(sorted(options.items())))
+        if key not in _worker_generators:
+            _worker_generators[key] = generators.factory.from_language(language, **options)
+
+        generator = _worker_generators[key]
+
+    from . import parser
+
+    results = {}
+
+    for source_file in sources:
+        errors = []
+
+        with open(source_file) as file:
+            program = parser.parse(source_file, file.read(), errors, layout, byte_order)
+
+        outputs = generator.generate_project(program, outdir)
+        results[source_file] = _check_outputs(language, outputs), errors
+
+    return results
+
+
+def _check_outputs(language, outputs):
+    """Returns the paths a generator returned as a list.
+
+    Raises:
+        TypeError: If outputs is not None or a sequence of paths
+    """
+
+    if outputs is None:
+        return None
+
+    if isinstance(outputs, (list, tuple)) and all(isinstance(p, (str, os.PathLike)) for p in outputs):
+        return list(outputs)
+
+    raise TypeError(f'The "{language}" generator should return a list of the paths it wrote, not {outputs!r}')
+
+
+def generate_project_from_template(source, outdir, uri, template, filters=None, layout='packed', byte_order='little'):
     """For the given C struct source code, generate source code using the given
     template and filters to read and write that data. The resulting source code
     will be written to disk at the location specified by outdir.
@@ -42,13 +230,44 @@ def generate_project_from_template(source, outdir, uri, template, filters=None):
 
         filters: An optional path to a Python module file that has a "filters"
             dictionary attribute.
+
+        layout: How struct members are aligned: "packed", "natural" or
+            "pack(n)".
+
+        byte_order: The byte order of multibyte values: "little", "big" or
+            "native".
+
+    Raises:
+        ValueError: If layout or byte_order is not supported
     """
+    check_layout(layout, byte_order)
     generator = generators.factory.from_template(template, filters)
-    _generate_project(source, outdir, uri, generator)
+    _generate_project(source, outdir, uri, generator, layout, byte_order)
+
+
+def check_layout(layout, byte_order='little'):
+    """Checks that a layout and byte order are supported.
+
+    Args:
+        layout: How struct members are aligned: "packed", "natural" or
+            "pack(n)".
+
+        byte_order: The byte order of multibyte values: "little", "big" or
+            "native".
+
+    Raises:
+        ValueError: If layout or byte_order is not supported
+    """
+
+    from .common import check_byte_order, parse_layout
+
+    parse_layout(layout)
+    check_byte_order(byte_order)
+
 
+def _generate_project(source, outdir, uri, generator, layout='packed', byte_order='little'):
+    os.makedirs(outdir, exist_ok=True)
 
-def _generate_project(source, outdir, uri, generator):
-    if not os.path.exists(outdir):
-        os.makedirs(outdir)
+    from . import parser
 
-    generator.generate_project(parser.parse(uri, source), outdir)
\ No newline at end of file
+    generator.generate_project(parser.parse(uri, source, layout=layout, byte_order=byte_order), outdir)
\ No newline at end of file
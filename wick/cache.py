@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+
+
+CACHE_FILE = '.wick-cache'
+
+
+def _hash_file(path):
+    try:
+        with open(path, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    except FileNotFoundError:
+        return None
+
+
+class Cache:
+    """On disk record of what was generated into an output directory.
+
+    Entries are keyed by source path. An entry is fresh if its key matches and
+    every output file still has the contents that were generated.
+    """
+
+    def __init__(self, outdir, version, fingerprint):
+        """Constructor
+
+        Args:
+            outdir: The output directory the cache file lives in
+
+            version: The wick version
+
+            fingerprint: A hash of the generator code, templates and filters
+        """
+
+        self.outdir = outdir
+        self.path = os.path.join(outdir, CACHE_FILE)
+        self._salt = f'{version}:{fingerprint}'
+        self._entries = {}
+        self._dirty = False
+
+        try:
+            with open(self.path) as file:
+                self._entries = json.load(file)['entries']
+
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def key(self, source, language, options):
+        """Returns the cache key for the given generation inputs.
+
+        Args:
+            source: The source text
+
+            language: The target language
+
+            options: The generator options
+
+        Returns:
+            A hex digest string
+        """
+
+        digest = hashlib.sha256()
+        digest.update(json.dumps([self._salt, language.lower(), sorted(options.items())]).encode('utf-8'))
+        digest.update(source.encode('utf-8'))
+
+        return digest.hexdigest()
+
+    def get(self, source_file, key):
+        """Returns the parse errors of a fresh entry.
+
+        Args:
+            source_file: The source path
+
+            key: The current cache key for the source
+
+        Returns:
+            A list of error messages, or None if there is no fresh entry
+        """
+
+        entry = self._entries.get(source_file)
+
+        if not entry or entry['key'] != key:
+            return None
+
+        for path, digest in entry['outputs'].items():
+            if _hash_file(os.path.join(self.outdir, path)) != digest:
+                return None
+
+        return entry['errors']
+
+    def set(self, source_file, key, outputs, errors):
+        """Records a generated source.
+
+        Args:
+            source_file: The source path
+
+            key: The cache key for the source
+
+            outputs: Paths of the files that were generated
+
+            errors: A list of error messages
+        """
+
+        self._entries[source_file] = {
+            'key': key,
+            'outputs': {os.path.relpath(p, self.outdir): _hash_file(p) for p in outputs},
+            'errors': errors
+        }
+        self._dirty = True
+
+    def save(self):
+        """Writes the cache file if anything changed."""
+
+        if not self._dirty:
+            return
+
+        with open(self.path, 'w') as file:
+            json.dump({'entries': self._entries}, file, indent=1, sort_keys=True)
+
+        self._dirty = False
@@ -3,21 +3,37 @@
 """Wick
 
 Usage:
-    wick <source> <language> [--directory=<dir>]
-    wick template <source> <template> [<filters>]
+    wick template compile <template> [<filters>]
+    wick template <source> <template> [<filters>] [--directory=<dir>] [--layout=<layout>] [--byte-order=<order>]
+    wick languages
+    wick watch <sources>... [--directory=<dir>] [--strings=<mode>] [--layout=<layout>] [--byte-order=<order>] [--interval=<s>]
+    wick <sources>... [--directory=<dir>] [--jobs=<n>] [--strings=<mode>] [--layout=<layout>] [--byte-order=<order>] [--no-cache]
     wick -h | --help
     wick --version
 
+Arguments:
+    <sources>  One or more source files or glob patterns, followed by the
+               target language. For example: wick a.h include/**/*.h python
+
 Options:
     -h --help             Show this screen.
     --version             Show version.
     -d --directory=<dir>  Directory to generate project. [default: ./out]
+    -j --jobs=<n>         Number of processes to generate with. [default: 1]
+    --strings=<mode>      Python char array handling: decode, raw or lazy.
+    --layout=<layout>     Struct member alignment: packed, natural or pack(n).
+                          [default: packed]
+    --byte-order=<order>  Byte order of values: little, big or native.
+                          [default: little]
+    --no-cache            Regenerate all sources, even if they are unchanged.
+    --interval=<s>        Seconds between checks for changes. [default: 0.2]
 """
 
+import glob
 import os
 import sys
 
-from docopt import docopt
+from docopt import DocoptExit, docopt
 
 import wick
 
@@ -26,15 +42,49 @@ def resolve_path(path):
     return os.path.normpath(os.path.abspath(os.path.expanduser(path)))
 
 
+def expand_sources(patterns):
+    """Expands glob patterns into a list of unique source paths.
+
+    Args:
+        patterns: File paths or glob patterns. Patterns that match nothing are
+            kept as is.
+
+    Returns:
+        A list of resolved paths in argument order
+    """
+
+    sources = []
+
+    for pattern in patterns:
+        matches = sorted(glob.glob(os.path.expanduser(pattern), recursive=True))
+
+        for path in matches or [pattern]:
+            path = resolve_path(path)
+
+            if path not in sources:
+                sources.append(path)
+
+    return sources
+
+
 def main():
     """Main CLI entrypoint"""
 
     arguments = docopt(__doc__, version=f'wick {wick.__version__}')
-    source_file = resolve_path(arguments['<source>'])
-    language = arguments['<language>']
     outdir = resolve_path(arguments['--directory'])
 
-    if arguments['template']:
+    try:
+        wick.check_layout(arguments['--layout'], arguments['--byte-order'])
+
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    if arguments['languages']:
+        for language in wick.generators.languages():
+            print(language)
+
+    elif arguments['template']:
         template = resolve_path(arguments['<template>'])
         template = os.path.abspath(os.path.expanduser(template))
 
@@ -42,16 +92,49 @@ def main():
             with open(template) as file:
                 template = file.read()
 
-        filters = resolve_path(arguments['<filters>'])
-        if not os.path.exists(filters):
+        filters = arguments['<filters>'] and resolve_path(arguments['<filters>'])
+        if filters and not os.path.exists(filters):
             filters = None
 
-        with open(source_file) as file:
-            wick.generate_project_from_template(file.read(), outdir, source_file, template, filters=filters)
+        if arguments['compile']:
+            from wick.generators.template import compile_template
+
+            print(compile_template(template, filters))
+
+        else:
+            source_file = resolve_path(arguments['<source>'])
+
+            with open(source_file) as file:
+                wick.generate_project_from_template(file.read(), outdir, source_file, template, filters=filters, layout=arguments['--layout'], byte_order=arguments['--byte-order'])
 
     else:
-        with open(source_file) as file:
-            wick.generate_project(file.read(), language, outdir, source_file)
+        if len(arguments['<sources>']) < 2:
+            raise DocoptExit()
+
+        *patterns, language = arguments['<sources>']
+
+        options = {}
+        if arguments['--strings']:
+            options['strings'] = arguments['--strings']
+
+        try:
+            jobs = int(arguments['--jobs'])
+            interval = float(arguments['--interval'])
+
+        except ValueError:
+            raise DocoptExit()
+
+        if jobs < 1:
+            raise DocoptExit()
+
+        if arguments['watch']:
+            from wick.watch import watch
+
+            print('Watching for changes. Press Ctrl+C to stop.')
+            watch(lambda: expand_sources(patterns), language, outdir, interval=interval, layout=arguments['--layout'], byte_order=arguments['--byte-order'], **options)
+
+        else:
+            wick.generate_projects(expand_sources(patterns), language, outdir, jobs=jobs, cache=not arguments['--no-cache'], layout=arguments['--layout'], byte_order=arguments['--byte-order'], **options)
 
     sys.exit(0)
 
@@ -24,7 +24,10 @@ def _get_length(symbol):
 
 
 def _get_size(symbol):
-    length = _get_length(symbol)
+    return _get_length(symbol) * _get_element_size(symbol)
+
+
+def _get_element_size(symbol):
     type = _get_type(symbol)
     format_char = {
         'char': 'c',
@@ -44,7 +47,63 @@ def _get_size(symbol):
         'double': 'd'
     }[type]
 
-    return length * struct.calcsize(f'<{format_char}')
+    return struct.calcsize(f'<{format_char}')
+
+
+layouts = ['packed', 'natural', 'pack(n)']
+
+
+def parse_layout(layout):
+    """Returns the largest member alignment allowed by a layout.
+
+    Args:
+        layout: "packed" for no padding, "natural" for C alignment or
+            "pack(n)" for alignment limited to n bytes like #pragma pack(n).
+
+    Returns:
+        An int, or None for no limit
+
+    Raises:
+        ValueError: If layout is not supported
+    """
+
+    if layout == 'packed':
+        return 1
+
+    if layout == 'natural':
+        return None
+
+    match = re.fullmatch(r'pack\((\d+)\)', layout)
+
+    if match:
+        pack = int(match.group(1))
+
+        if pack in (1, 2, 4, 8, 16):
+            return pack
+
+    raise ValueError(f'Unsupported layout: "{layout}"')
+
+
+byte_orders = ['little', 'big', 'native']
+
+
+def check_byte_order(byte_order):
+    """Checks that a byte order is supported.
+
+    Args:
+        byte_order: "little", "big" or "native" for the byte order of the
+            machine running the generated code.
+
+    Raises:
+        ValueError: If byte_order is not supported
+    """
+
+    if byte_order not in byte_orders:
+        raise ValueError(f'Unsupported byte order: "{byte_order}"')
+
+
+def _align(offset, alignment):
+    return -(-offset // alignment) * alignment
 
 
 def _sanitize_comment(text):
@@ -71,57 +130,133 @@ def _sanitize_comment(text):
     return text
 
 
-def _get_comment(comments, symbol):
-    """Get the nearest comment for the given symbol.
+class _CommentMap:
+    """Line indexed lookup of comments and symbols for a ParseTree.
 
-    Args:
-        comments: The ParseTree comments to consider
+    Built once per Program so each comment lookup is a constant number of
+    dict lookups instead of a scan over every comment and symbol.
+    """
 
-        symbol: The symbol to find a comment for
+    def __init__(self, comments):
+        """Constructor
 
-    Returns:
-        The text of the comment as a string
-    """
+        Args:
+            comments: The ParseTree comments to consider. These are in line
+                number order.
+        """
+
+        self._comments_by_start_line = {}
+        self._comments_by_end_line = {}
+        self._symbol_lines = {}
+
+        for comment in comments:
+            self._comments_by_start_line.setdefault(comment.range.start.line, comment)
+            self._comments_by_end_line.setdefault(comment.range.end.line, comment)
 
-    # Grab all symbols in current scope
-    symbols = [s for s in symbol.scope.definitions.values()]
+    def _get_symbol_lines(self, scope):
+        """Get the set of lines that name symbols in the given scope end on."""
 
-    # Grab symbols in the inner scope if the symbol is a struct
-    if hasattr(symbol, 'inner_scope') and symbol.type.value == 'struct':
-        symbols += [s for s in symbol.inner_scope.definitions.values()]
+        if scope is None:
+            return set()
 
-    # Only consider name symbols
-    symbols = [s for s in symbols if s.arity == 'name' and s != symbol]
+        lines = self._symbol_lines.get(scope)
 
-    symbols_on_line_above = [s for s in symbols if s.range.end.line == symbol.range.start.line - 1]
+        if lines is None:
+            lines = {s.range.end.line for s in scope.definitions.values() if s.arity == 'name'}
+            self._symbol_lines[scope] = lines
 
-    for comment in comments:
-        # Comments are in line number order
-        if comment.range.end.line > symbol.range.end.line:
-            break
+        return lines
+
+    def _has_symbol_on_line(self, symbol, line):
+        if line in self._get_symbol_lines(symbol.scope):
+            return True
+
+        # Consider symbols in the inner scope if the symbol is a struct
+        if hasattr(symbol, 'inner_scope') and symbol.type.value == 'struct':
+            return line in self._get_symbol_lines(symbol.inner_scope)
+
+        return False
+
+    def get_comment(self, symbol):
+        """Get the nearest comment for the given symbol.
+
+        Args:
+            symbol: The symbol to find a comment for
+
+        Returns:
+            The text of the comment as a string
+        """
+
+        line_above = symbol.range.start.line - 1
 
         # Prefer comments immediately above a symbol, unless there is
         # another symbol immediately above.
-        if comment.range.end.line == symbol.range.start.line - 1 and not symbols_on_line_above:
+        comment = self._comments_by_end_line.get(line_above)
+
+        if comment and not self._has_symbol_on_line(symbol, line_above):
             return _sanitize_comment(comment.value)
 
         # Also consider comments on the same line as the symbol
-        if comment.range.start.line == symbol.range.start.line:
+        comment = self._comments_by_start_line.get(symbol.range.start.line)
+
+        if comment and comment.range.end.line <= symbol.range.end.line:
             return _sanitize_comment(comment.value)
 
-    return ''
+        return ''
 
 
 class Struct:
+    """
+    Attributes:
+        members: A sequence of DataMember objects. Members of struct type
+            have a struct attribute.
+
+        fields: The members with nested structs flattened into their fields,
+            in offset order. Offsets are from the start of this struct, so a
+            whole record can be read with a single format.
+
+        byte_order: The byte order of multibyte values: "little", "big" or
+            "native".
+    """
+
     def __init__(self,
                  name,
                  description,
-                 members):
+                 members,
+                 padding=0,
+                 alignment=1,
+                 byte_order='little'):
 
         self.name = name
         self.description = description
         self.members = members
-        self.size = sum([m.size for m in members])
+        self.padding = padding
+        self.alignment = alignment
+        self.byte_order = byte_order
+        self.size = sum([m.padding + m.size for m in members]) + padding
+        self.fields = []
+
+        for member in members:
+            if member.struct is None:
+                self.fields.append(member)
+                continue
+
+            member.elements = []
+
+            for i in range(member.length):
+                if member.length == 1:
+                    name = f'{member.name}_'
+                    prefix = f'{member.name}.'
+
+                else:
+                    name = f'{member.name}_{i}_'
+                    prefix = f'{member.name}[{i}].'
+
+                offset = member.offset + i * member.struct.size
+                element = [f.nested(name, prefix, offset) for f in member.struct.fields]
+
+                member.elements.append(element)
+                self.fields += element
 
 
 class DataMember:
@@ -131,7 +266,9 @@ class DataMember:
                  size,
                  offset,
                  length,
-                 description):
+                 description,
+                 padding=0,
+                 struct=None):
 
         self.name = name
         self.type = type
@@ -139,6 +276,39 @@ class DataMember:
         self.offset = offset
         self.length = length
         self.description = description
+        self.padding = padding
+        self.struct = struct
+
+        # How the member is reached from the record it was flattened into
+        self.prefix = ''
+        self.attribute = name
+
+    @property
+    def path(self):
+        return f'{self.prefix}{self.attribute}'
+
+    def nested(self, name, prefix, offset):
+        """Returns a copy of this member as a field of an enclosing struct.
+
+        Args:
+            name: Prefix for the field name
+
+            prefix: Prefix for the attribute path
+
+            offset: Offset of this member's struct in the enclosing struct
+        """
+
+        field = DataMember(f'{name}{self.name}',
+                           self.type,
+                           self.size,
+                           offset + self.offset,
+                           self.length,
+                           self.description)
+
+        field.prefix = f'{prefix}{self.prefix}'
+        field.attribute = self.attribute
+
+        return field
 
     @property
     def unpack(self):
@@ -162,7 +332,8 @@ class DataMember:
                                      size,
                                      offset,
                                      length,
-                                     description)
+                                     description,
+                                     self.padding if i == 0 else 0)
 
             elements.append(data_member)
             offset += size
@@ -178,48 +349,96 @@ class Program:
         structs: A sequence of Struct objects
     """
 
-    def __init__(self, uri, parse_tree):
+    def __init__(self, uri, parse_tree, layout='packed', byte_order='little'):
         """Constructor
 
         Args:
             uri: The source document uri
 
             parse_tree: The ParseTree object to process
+
+            layout: How members are aligned. See parse_layout.
+
+            byte_order: The byte order of every struct. See byte_orders.
         """
         self.uri = uri
         self.name = os.path.basename(uri).split('.')[0]
+        self.layout = layout
+        self.byte_order = byte_order
         self.structs = []
+        pack = parse_layout(layout)
+        check_byte_order(byte_order)
+        comment_map = _CommentMap(parse_tree.comments)
 
         # Only consider symbols that are structs and not struct aliases
         struct_symbols = [d for d in parse_tree.scope.definitions.values() if hasattr(d, 'type') and d.type.value == 'struct' and not hasattr(d, 'is_alias')]
 
+        # Structs by name, for resolving struct members. A struct can only
+        # contain structs defined before it, so they are laid out first.
+        structs = {}
+
         for symbol in struct_symbols:
+            # Skip forward declarations
+            if symbol.inner_scope is None:
+                continue
+
             # Only consider named symbols (variables)
-            variable_symbols = [d for d in symbol.inner_scope.definitions.values() if d.arity == 'name']
+            variable_symbols = [d for d in symbol.inner_scope.definitions.values() if d.arity == 'name' and not d.reserved]
 
             members = []
             offset = 0
+            struct_alignment = 1
             for variable_symbol in variable_symbols:
                 name = variable_symbol.value
                 type = _get_type(variable_symbol)
-                size = _get_size(variable_symbol)
                 length = _get_length(variable_symbol)
-                description = _get_comment(parse_tree.comments, variable_symbol)
+                description = comment_map.get_comment(variable_symbol)
+                nested_struct = None
+
+                if hasattr(variable_symbol.type, 'inner_scope'):
+                    nested_struct = structs.get(type)
+
+                    # Members of unknown or incomplete structs are parse errors
+                    if nested_struct is None:
+                        continue
+
+                    size = length * nested_struct.size
+                    alignment = nested_struct.alignment
+
+                else:
+                    size = _get_size(variable_symbol)
+
+                    # Members are aligned to the standard size of their
+                    # element type, unless the layout limits it.
+                    alignment = _get_element_size(variable_symbol)
+
+                if pack is not None:
+                    alignment = min(alignment, pack)
+
+                struct_alignment = max(struct_alignment, alignment)
+                padding = _align(offset, alignment) - offset
+                offset += padding
 
                 data_member = DataMember(name,
                                          type,
                                          size,
                                          offset,
                                          length,
-                                         description)
+                                         description,
+                                         padding,
+                                         nested_struct)
 
                 members.append(data_member)
                 offset += size
 
             struct = Struct(
                 name=symbol.value,
-                description=_get_comment(parse_tree.comments, symbol),
-                members=members
+                description=comment_map.get_comment(symbol),
+                members=members,
+                padding=_align(offset, struct_alignment) - offset,
+                alignment=struct_alignment,
+                byte_order=byte_order
             )
 
             self.structs.append(struct)
+            structs[struct.name] = struct
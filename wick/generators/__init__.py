@@ -1,49 +1,179 @@
+import functools
+import hashlib
+import importlib
 import sys
 
-from . import csharp
-from . import javascript
-from . import markdown
-from . import python
-from . import template
+from . import common
+from .common import OutputSink
 
-_language_modules = [
-    csharp,
-    javascript,
-    markdown,
-    python
-]
+# Entry point group for generator plugins. Each entry point name is a language
+# and its object is a get_generator(language, **options) function.
+ENTRY_POINT_GROUP = 'wick.generators'
+
+# Generators that ship with wick, as module name to the language names it
+# handles. The modules check languages against these lists too.
+builtin_languages = {
+    'csharp': ['csharp', 'c#'],
+    'javascript': ['javascript', 'ecmascript'],
+    'markdown': ['markdown'],
+    'numpy': ['numpy', 'python-numpy'],
+    'python': ['python']
+}
+
+
+def _load_reference(reference):
+    module_name, _, attribute = reference.partition(':')
+
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+# Language name to a function that imports its get_generator function.
+_registry = {
+    language: functools.partial(_load_reference, f'{__name__}.{module}:get_generator')
+    for module, module_languages in builtin_languages.items()
+    for language in module_languages
+}
+_plugins_loaded = False
+
+# Plugin language name to its entry point
+_plugin_entry_points = {}
+
+
+def _iter_entry_points():
+    try:
+        from importlib.metadata import entry_points
+
+    except ImportError:
+        import pkg_resources
+
+        return pkg_resources.iter_entry_points(ENTRY_POINT_GROUP)
+
+    entry_points = entry_points()
+
+    if hasattr(entry_points, 'select'):
+        return entry_points.select(group=ENTRY_POINT_GROUP)
+
+    return entry_points.get(ENTRY_POINT_GROUP, [])
+
+
+def _load_plugins():
+    """Adds plugin languages to the registry.
+
+    Scanning installed packages is slow, so it only happens once and only
+    when a language is not built in. Built in languages can't be replaced.
+    """
+
+    global _plugins_loaded
+
+    if _plugins_loaded:
+        return
+
+    for entry_point in _iter_entry_points():
+        language = entry_point.name.lower()
+
+        if language not in _registry:
+            _registry[language] = entry_point.load
+            _plugin_entry_points[language] = entry_point
+
+    _plugins_loaded = True
+
+
+def _find_generator_loader(language):
+    """Returns a function that imports the get_generator function for the
+    given language, or None if the language is unknown.
+    """
+
+    language = language.lower()
+
+    if language not in _registry:
+        _load_plugins()
+
+    return _registry.get(language)
+
+
+def languages():
+    """Returns a sorted list of the available language names."""
+
+    _load_plugins()
+
+    return sorted(_registry)
 
 
 def is_valid_language(language):
-    for module in _language_modules:
-        if module.is_valid_language(language):
-            return True
+    return _find_generator_loader(language) is not None
+
+
+def fingerprint(language=None):
+    """Returns a hash of the code used to generate the given language.
+
+    This covers the built in generator code, templates and filters. For plugin
+    languages it also covers the plugin's distribution version and the module
+    its get_generator function is defined in, so upgrading a plugin
+    invalidates cached output.
+
+    Args:
+        language: An optional language name
+
+    Returns:
+        A hex digest string
+    """
 
-    return False
+    result = common.fingerprint()
+
+    if language is None or not is_valid_language(language):
+        return result
+
+    entry_point = _plugin_entry_points.get(language.lower())
+
+    if entry_point is None:
+        return result
+
+    digest = hashlib.sha256(result.encode('utf-8'))
+    dist = getattr(entry_point, 'dist', None)
+
+    if dist is not None:
+        name = getattr(dist, 'project_name', None) or dist.metadata['Name']
+        digest.update(f'{name}=={dist.version}'.encode('utf-8'))
+
+    module = sys.modules.get(entry_point.load().__module__)
+    path = getattr(module, '__file__', None)
+
+    if path:
+        with open(path, 'rb') as file:
+            digest.update(file.read())
+
+    return digest.hexdigest()
 
 
 class factory:
     @staticmethod
-    def from_language(language):
+    def from_language(language, **options):
         """Get a generator for the given language
 
         Args:
             language: A language name
 
+            options: Generator specific options
+
         Returns:
-            A Python module
+            A Generator
         """
 
         if not is_valid_language(language):
             print(f'Unsupported languge: "{language}"', file=sys.stderr)
             sys.exit(1)
 
-        for module in _language_modules:
-            generator = module.get_generator(language)
+        get_generator = _find_generator_loader(language)()
 
-            if generator:
-                return generator
+        try:
+            return get_generator(language, **options)
+
+        except (TypeError, ValueError) as e:
+            print(f'Unsupported options for "{language}": {e}', file=sys.stderr)
+            sys.exit(1)
 
     @staticmethod
     def from_template(template_string, filters):
+        from . import template
+
         return template.get_generator(template_string, filters)
\ No newline at end of file
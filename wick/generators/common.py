@@ -0,0 +1,258 @@
+import functools
+import hashlib
+import os
+import threading
+
+
+def write_file(path, chunks):
+    """Writes text to the given path unless the file already contains it.
+
+    The text is streamed to a temporary file next to path while it is compared
+    with the existing file, so it never has to be held in memory as a whole.
+    The temporary file is synced to disk and only renamed over path if the
+    contents differ, so path always holds either the old or the new contents.
+    Unchanged files are left alone so their modification times are kept and
+    downstream builds are not triggered.
+
+    Args:
+        path: The file path to write
+
+        chunks: The file contents as a string or an iterable of strings
+
+    Returns:
+        The path
+    """
+
+    if isinstance(chunks, str):
+        chunks = [chunks]
+
+    directory, name = os.path.split(path)
+    temp_path = os.path.join(directory, f'.{name}.{os.getpid()}.{threading.get_ident()}.tmp')
+
+    try:
+        existing = open(path)
+
+    except OSError:
+        existing = None
+
+    try:
+        unchanged = existing is not None
+
+        with open(temp_path, 'w') as file:
+            for chunk in chunks:
+                file.write(chunk)
+
+                if unchanged:
+                    unchanged = _read_matches(existing, chunk)
+
+            # The existing file should have nothing left
+            if unchanged:
+                unchanged = _read_matches(existing, '', 1)
+
+            if not unchanged:
+                file.flush()
+                os.fsync(file.fileno())
+
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    finally:
+        if existing is not None:
+            existing.close()
+
+    if unchanged:
+        os.remove(temp_path)
+
+    else:
+        os.replace(temp_path, path)
+
+    return path
+
+
+def _read_matches(file, text, size=None):
+    """Returns True if the next size characters of file equal text.
+
+    Size defaults to the length of text. Files that can't be read or decoded
+    never match, so they are overwritten.
+    """
+
+    try:
+        return file.read(len(text) if size is None else size) == text
+
+    except (OSError, UnicodeError):
+        return False
+
+
+class OutputSink:
+    """Collects the files of a generated project and writes them together.
+
+    Every file is written with write_file, so outputs are replaced atomically
+    and unchanged files are skipped. Files are written on a thread pool when
+    there are several, so syncing one file to disk does not hold up the rest.
+    """
+
+    def __init__(self, max_workers=None):
+        """Constructor
+
+        Args:
+            max_workers: The most files to write at once. Defaults to the
+                ThreadPoolExecutor default.
+        """
+
+        self.max_workers = max_workers
+        self._outputs = []
+
+    def add(self, path, chunks):
+        """Adds a file to be written on the next flush.
+
+        Args:
+            path: The file path to write
+
+            chunks: The file contents as a string or an iterable of strings.
+                Iterables are not consumed until the file is written.
+        """
+
+        self._outputs.append((path, chunks))
+
+    def flush(self):
+        """Writes the added files.
+
+        Every file is written even if another one fails. The first error is
+        raised once all writes have finished.
+
+        Returns:
+            A list of the written paths, in the order they were added
+        """
+
+        outputs, self._outputs = self._outputs, []
+
+        if len(outputs) < 2 or self.max_workers == 1:
+            return [write_file(path, chunks) for path, chunks in outputs]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            futures = [executor.submit(write_file, path, chunks) for path, chunks in outputs]
+
+        return [future.result() for future in futures]
+
+
+def fingerprint():
+    """Returns a hash of the generator code, templates and filters.
+
+    Returns:
+        A hex digest string
+    """
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+
+    for directory, directories, files in os.walk(root):
+        directories[:] = sorted(d for d in directories if d != '__pycache__')
+
+        for name in sorted(files):
+            if not name.endswith(('.py', '.jinja2')):
+                continue
+
+            path = os.path.join(directory, name)
+            digest.update(os.path.relpath(path, root).encode('utf-8'))
+
+            with open(path, 'rb') as file:
+                digest.update(file.read())
+
+    return digest.hexdigest()
+
+
+def cache_directory():
+    """Returns the user cache directory for wick.
+
+    WICK_CACHE_DIR overrides the platform default.
+    """
+
+    if os.environ.get('WICK_CACHE_DIR'):
+        return os.environ['WICK_CACHE_DIR']
+
+    if os.name == 'nt' and os.environ.get('LOCALAPPDATA'):
+        return os.path.join(os.environ['LOCALAPPDATA'], 'wick', 'cache')
+
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+
+    return os.path.join(base, 'wick')
+
+
+def make_environment(package, filters, shared_packages=()):
+    """Returns a jinja2 Environment for a generator package.
+
+    Templates are loaded from the templates directory of package, then from
+    those of the shared packages. Compiled templates are kept in the bytecode
+    cache.
+
+    Args:
+        package: The generator package name
+
+        filters: A dictionary of filters to add to the default filters
+
+        shared_packages: Names of other generator packages whose templates
+            can be imported
+
+    Returns:
+        An Environment
+    """
+
+    import importlib
+
+    from jinja2 import Environment, FileSystemLoader
+
+    directories = [
+        os.path.join(os.path.dirname(importlib.import_module(name).__file__), 'templates')
+        for name in [package, *shared_packages]
+    ]
+
+    env = Environment(
+        loader=FileSystemLoader(directories),
+        bytecode_cache=get_bytecode_cache()
+    )
+
+    env.filters = {**env.filters, **filters}
+
+    return env
+
+
+@functools.lru_cache(maxsize=None)
+def get_bytecode_cache():
+    """Returns a jinja2 bytecode cache in the user cache directory.
+
+    Compiled templates are stored there so later runs can skip compilation.
+
+    Returns:
+        A FileSystemBytecodeCache, or None if the directory is not writable
+    """
+
+    from jinja2 import FileSystemBytecodeCache
+
+    class BytecodeCache(FileSystemBytecodeCache):
+        # The cache only saves time, so failing to use it is not an error.
+        def load_bytecode(self, bucket):
+            try:
+                super().load_bytecode(bucket)
+
+            except OSError:
+                pass
+
+        def dump_bytecode(self, bucket):
+            try:
+                super().dump_bytecode(bucket)
+
+            except OSError:
+                pass
+
+    directory = os.path.join(cache_directory(), 'jinja2')
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+
+    except OSError:
+        return None
+
+    return BytecodeCache(directory)
@@ -1,15 +1,18 @@
-from collections import namedtuple
+import functools
+import os
 
-from jinja2 import Environment, PackageLoader
+from collections import namedtuple
 
 from . import filters
+from .. import builtin_languages
+from ..common import OutputSink, make_environment
 
 
 Generator = namedtuple('Generator', ['generate_project'])
 
 
 def is_valid_language(language):
-    return language.lower() in ['csharp', 'c#']
+    return language.lower() in builtin_languages['csharp']
 
 
 def get_generator(language):
@@ -19,17 +22,19 @@ def get_generator(language):
         )
 
 
-def generate_project(program, out_directory):
-    import os
+@functools.lru_cache(maxsize=None)
+def get_environment():
+    """Returns the shared Environment for this generator."""
 
+    return make_environment(__name__, filters.filters)
+
+
+def generate_project(program, out_directory):
     module_path = os.path.join(out_directory, f'{filters.pascal_case(program.name)}.cs')
 
-    env = Environment(
-        loader=PackageLoader('wick.generators.csharp', 'templates')
-    )
+    template = get_environment().get_template('main.jinja2')
 
-    env.filters = {**env.filters, **filters.filters}
+    sink = OutputSink()
+    sink.add(module_path, template.generate(program=program))
 
-    with open(module_path, 'w') as file:
-        template = env.get_template('main.jinja2')
-        file.write(template.render(program=program))
+    return sink.flush()
@@ -31,7 +31,11 @@ def csharp_type(member, show_length=False):
     if member.type == 'char' and member.length > 1:
         return 'string'
 
-    type = integral_type(member)
+    if member.struct:
+        type = pascal_case(member.type)
+
+    else:
+        type = integral_type(member)
 
     if member.length > 1:
         return f'{type}[{member.length if show_length else ""}]'
@@ -40,6 +44,10 @@ def csharp_type(member, show_length=False):
 
 
 def reader_method(member):
+    # Structs are read with their generated BinaryReader extension method
+    if member.struct:
+        return f'Read{pascal_case(member.type)}'
+
     type = integral_type(member)
 
     method = {
@@ -59,6 +67,61 @@ def reader_method(member):
     return method
 
 
+# Floating point values are swapped as integers of the same size
+float_bits = {
+    'float': ('Int32', 'Single'),
+    'double': ('Int64', 'Double')
+}
+
+
+def _swap_bytes(value, byte_order):
+    swapped = f'BinaryPrimitives.ReverseEndianness({value})'
+
+    # BinaryReader and BinaryWriter are always little endian
+    if byte_order == 'native':
+        return f'BitConverter.IsLittleEndian ? {value} : {swapped}'
+
+    return swapped
+
+
+def _has_byte_order(member, byte_order):
+    return byte_order != 'little' and not member.struct and member.size // member.length > 1
+
+
+def read_expression(member, byte_order='little'):
+    """Returns an expression that reads a single element of member.
+
+    Values are only swapped if byte_order is not little endian.
+    """
+
+    if not _has_byte_order(member, byte_order):
+        return f'reader.{reader_method(member)}()'
+
+    if member.type in float_bits:
+        bits, type = float_bits[member.type]
+        value = _swap_bytes(f'reader.Read{bits}()', byte_order)
+
+        return f'BitConverter.{bits}BitsTo{type}({value})'
+
+    return _swap_bytes(f'reader.{reader_method(member)}()', byte_order)
+
+
+def write_expression(member, value, byte_order='little'):
+    """Returns the value to write for a single element of member.
+
+    Values are only swapped if byte_order is not little endian.
+    """
+
+    if not _has_byte_order(member, byte_order):
+        return value
+
+    if member.type in float_bits:
+        bits, type = float_bits[member.type]
+        value = f'BitConverter.{type}To{bits}Bits({value})'
+
+    return _swap_bytes(value, byte_order)
+
+
 def lines(text):
     ls = text.split('\n')
 
@@ -123,6 +186,8 @@ filters = {
     'pascalcase': pascal_case,
     'csharptype': csharp_type,
     'readermethod': reader_method,
+    'readexpression': read_expression,
+    'writeexpression': write_expression,
     'comment': comment,
     'singlelinecomment': single_line_comment,
     'multilinecomment': multi_line_comment,
@@ -32,7 +32,27 @@ def set_method(member):
     return method
 
 
+def little_endian_argument(member, byte_order):
+    """Returns the DataView littleEndian argument for the given member.
+
+    Native byte order uses the littleEndian constant, which is the byte order
+    of the machine running the code. Single bytes have no byte order.
+    """
+
+    if member.size // member.length == 1:
+        return ''
+
+    return {
+        'little': ', true',
+        'big': ', false',
+        'native': ', littleEndian'
+    }[byte_order]
+
+
 def javascript_type(member):
+    if member.struct:
+        return f'{member.type}[]' if member.length > 1 else member.type
+
     if member.length > 1:
         if member.type == 'char':
             return 'string'
@@ -107,6 +127,7 @@ def prepend_lines(text, prepend_string):
 filters = {
     'getmethod': get_method,
     'setmethod': set_method,
+    'littleendian': little_endian_argument,
     'comment': comment,
     'javascripttype': javascript_type,
     'prependlines': prepend_lines
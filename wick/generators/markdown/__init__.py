@@ -3,13 +3,15 @@ import os
 from collections import namedtuple
 
 from . import document
+from .. import builtin_languages
+from ..common import OutputSink
 
 
 Generator = namedtuple('Generator', ['generate_project'])
 
 
 def is_valid_language(language):
-    return language.lower() in ['markdown']
+    return language.lower() in builtin_languages['markdown']
 
 
 def get_generator(language):
@@ -22,5 +24,7 @@ def get_generator(language):
 def generate_project(program, out_directory):
     doc_path = os.path.join(out_directory, f'{program.name}.md')
 
-    with open(doc_path, 'w') as file:
-        file.write(document.generate_source(program))
+    sink = OutputSink()
+    sink.add(doc_path, document.generate_chunks(program))
+
+    return sink.flush()
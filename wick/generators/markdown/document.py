@@ -5,14 +5,17 @@ from . import elements
 
 
 class DataMemberTable(elements.Table):
-    def __init__(self, members):
+    def __init__(self, members, padding=0):
         super().__init__(('Offset', 'Size', 'Type', 'Description', 'Notes'))
 
-        total_bytes = sum([p.size for p in members])
+        total_bytes = sum([p.padding + p.size for p in members]) + padding
         hex_width = max(4, len(hex(total_bytes)))
         current_bytes = 0
 
         for prop in members:
+            if prop.padding:
+                self.add_padding(prop.offset - prop.padding, prop.padding, hex_width)
+
             offset = common.to_hex(prop.offset, hex_width)
             size = prop.size
             type = common.get_type_string(prop)
@@ -29,6 +32,18 @@ class DataMemberTable(elements.Table):
 
             current_bytes += size
 
+        if padding:
+            self.add_padding(total_bytes - padding, padding, hex_width)
+
+    def add_padding(self, offset, size, hex_width):
+        self.add_entry((
+            common.to_hex(offset, hex_width),
+            size,
+            'padding',
+            '',
+            ''
+        ))
+
 
 class Document:
     def __init__(self):
@@ -38,7 +53,24 @@ class Document:
         self._elements.append(element)
 
     def __str__(self):
-        return '\n'.join([str(e) for e in self._elements])
+        return ''.join(self.chunks())
+
+    def chunks(self):
+        """Yields the document text one element at a time."""
+
+        return _join_chunks(self._elements)
+
+
+def _join_chunks(elements):
+    for i, element in enumerate(elements):
+        if i:
+            yield '\n'
+
+        if isinstance(element, Document):
+            yield from element.chunks()
+
+        else:
+            yield str(element)
 
 
 def generate_section(struct):
@@ -48,25 +80,38 @@ def generate_section(struct):
     if struct.description:
         doc.add(elements.PlainText(struct.description))
 
+    if struct.byte_order != 'little':
+        doc.add(elements.BlankLine())
+        doc.add(elements.PlainText(f'Values are {struct.byte_order} endian.'))
+
     if struct.members:
         doc.add(elements.BlankLine())
-        doc.add(DataMemberTable(struct.members))
+        doc.add(DataMemberTable(struct.members, struct.padding))
 
     return doc
 
 
 def generate_source(parse_tree):
-    doc = Document()
+    return ''.join(generate_chunks(parse_tree))
+
+
+def generate_chunks(parse_tree):
+    """Yields the document text for the given Program in pieces.
+
+    Sections are built one struct at a time, so only a single section is held
+    in memory.
+    """
 
+    return _join_chunks(_generate_elements(parse_tree))
+
+
+def _generate_elements(parse_tree):
     if parse_tree.uri:
         filename = os.path.basename(parse_tree.uri)
         filename = filename.split('.')[0].capitalize()
-        doc.add(elements.H1(filename))
-        doc.add(elements.BlankLine())
+        yield elements.H1(filename)
+        yield elements.BlankLine()
 
     for struct in parse_tree.structs:
-        doc.add(generate_section(struct))
-        doc.add(elements.BlankLine())
-
-    result = str(doc)
-    return result
+        yield generate_section(struct)
+        yield elements.BlankLine()
@@ -0,0 +1,55 @@
+import functools
+import os
+
+from collections import namedtuple
+
+from . import filters
+from .. import builtin_languages, python
+from ..common import OutputSink, make_environment
+
+
+Generator = namedtuple('Generator', ['generate_project'])
+
+
+def is_valid_language(language):
+    return language.lower() in builtin_languages['numpy']
+
+
+def get_generator(language, strings='decode'):
+    if strings not in python.string_modes:
+        raise ValueError(f'Unsupported string mode: "{strings}"')
+
+    if is_valid_language(language):
+        def generate(program, out_directory):
+            return generate_project(program, out_directory, strings=strings)
+
+        return Generator(
+            generate_project=generate
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def get_environment():
+    """Returns the shared Environment for this generator."""
+
+    # The Python templates are also searched so test fixtures can be shared
+    return make_environment(__name__, filters.filters, [python.__name__])
+
+
+def generate_project(program, out_directory, strings='decode'):
+    # The numpy module is generated alongside the regular Python module
+    paths = python.generate_project(program, out_directory, strings=strings)
+
+    test_dir = os.path.join(out_directory, 'tests')
+    module_path = os.path.join(out_directory, f'{program.name}_numpy.py')
+    test_path = os.path.join(test_dir, f'test_{program.name}_numpy.py')
+
+    env = get_environment()
+
+    # The Python project is flushed first since its tests share the test data
+    # values that the numpy tests continue from.
+    sink = OutputSink()
+    sink.add(module_path, env.get_template('main.jinja2').generate(program=program, strings=strings))
+    sink.add(test_path, env.get_template('test.jinja2').generate(program=program, strings=strings))
+
+    return paths + sink.flush()
@@ -0,0 +1,68 @@
+import re
+
+from ..python import filters as python_filters
+
+
+def dtype_format(member, byte_order='little'):
+    """Returns the numpy dtype format for the given member
+
+    Args:
+        member: A DataMember
+
+        byte_order: The byte order of multibyte values: "little", "big" or
+            "native".
+    """
+
+    if member.struct:
+        format = f'{member.type}.dtype'
+
+        if member.length > 1:
+            return f'({format}, ({member.length},))'
+
+        return format
+
+    if member.type == 'char':
+        return f"'S{member.length}'"
+
+    format = {
+        'signed char': 'i1',
+        'unsigned char': 'u1',
+        'short': 'i2',
+        'unsigned short': 'u2',
+        'int': 'i4',
+        'unsigned int': 'u4',
+        'long': 'i4',
+        'unsigned long': 'u4',
+        'long long': 'i8',
+        'unsigned long long': 'u8',
+        'float': 'f4',
+        'double': 'f8'
+    }[member.type]
+
+    # Single bytes have no byte order
+    if member.size // member.length > 1:
+        format = python_filters.byte_order_prefix(byte_order) + format
+
+    if member.length > 1:
+        return f"('{format}', ({member.length},))"
+
+    return f"'{format}'"
+
+
+def field_index(path):
+    """Returns the index expression for a field path on a record array.
+
+    For example "points[1].x" becomes "['points'][:, 1]['x']".
+    """
+
+    path = re.sub(r'\[(\d+)\]', r'[:, \1]', path)
+
+    return re.sub(r'\.?([A-Za-z_]\w*)', r"['\1']", path)
+
+
+filters = {
+    'dtypeformat': dtype_format,
+    'fieldindex': field_index,
+    'snakecase': python_filters.snake_case,
+    'testdata': python_filters.test_data
+}
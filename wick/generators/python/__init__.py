@@ -1,54 +1,72 @@
-from collections import namedtuple
+import functools
+import os
 
-from jinja2 import Environment, PackageLoader
+from collections import namedtuple
 
 from . import filters
+from .. import builtin_languages
+from ..common import OutputSink, make_environment
 
 
 Generator = namedtuple('Generator', ['generate_project'])
 
 
 def is_valid_language(language):
-    return language.lower() in ['python']
+    return language.lower() in builtin_languages['python']
+
+
+string_modes = ['decode', 'raw', 'lazy']
+
+
+def get_generator(language, strings='decode'):
+    """Get a generator for the given language
+
+    Args:
+        language: A language name
 
+        strings: How char array members are handled by generated classes.
+            "decode" decodes them to str on construction, "raw" keeps them
+            as bytes and "lazy" keeps them as bytes until first access.
+
+    Returns:
+        A Generator
+    """
+
+    if strings not in string_modes:
+        raise ValueError(f'Unsupported string mode: "{strings}"')
 
-def get_generator(language):
     if is_valid_language(language):
-        return Generator(
-            generate_project=generate_project
-        )
+        def generate(program, out_directory):
+            return generate_project(program, out_directory, strings=strings)
 
-    if language.lower() == 'python-test':
         return Generator(
-            generate_project=generate_project
+            generate_project=generate
         )
 
 
-def generate_project(program, out_directory):
-    import os
+@functools.lru_cache(maxsize=None)
+def get_environment():
+    """Returns the shared Environment for this generator."""
+
+    return make_environment(__name__, filters.filters)
+
 
+def generate_project(program, out_directory, strings='decode'):
     test_dir = os.path.join(out_directory, 'tests')
-    if not os.path.exists(test_dir):
-        os.makedirs(test_dir)
+    os.makedirs(test_dir, exist_ok=True)
 
     module_path = os.path.join(out_directory, f'{program.name}.py')
     test_path = os.path.join(test_dir, f'test_{program.name}.py')
 
-    env = Environment(
-        loader=PackageLoader('wick.generators.python', 'templates')
-    )
+    env = get_environment()
 
-    env.filters['formatstring'] = filters.format_string
-    env.filters['spaces'] = filters.spaces
-    env.filters['snakecase'] = filters.snake_case
-    env.filters['pascalcase'] = filters.pascal_case
-    env.filters['testdata'] = filters.test_data
+    # Test data cycles through interesting values. Start every project from
+    # the beginning so output does not depend on what was generated before.
+    filters.value_generators.clear()
 
-    with open(module_path, 'w') as file:
-        template = env.get_template('main.jinja2')
-        file.write(template.render(program=program))
+    sink = OutputSink()
+    sink.add(module_path, env.get_template('main.jinja2').generate(program=program, strings=strings))
+    sink.add(test_path, env.get_template('test.jinja2').generate(program=program, strings=strings))
 
-    with open(test_path, 'w') as file:
-        template = env.get_template('test.jinja2')
-        file.write(template.render(program=program))
+    return sink.flush()
 
@@ -27,40 +27,89 @@ def spaces(text):
     return ' ' * len(text)
 
 
-def format_string(members):
+format_characters = {
+    'char': 'c',
+    'signed char': 'b',
+    'unsigned char': 'B',
+    'short': 'h',
+    'unsigned short': 'H',
+    'int': 'i',
+    'unsigned int': 'I',
+    'long': 'l',
+    'unsigned long': 'L',
+    'long long': 'q',
+    'unsigned long long': 'Q',
+    'ssize_t': 'n',
+    'size_t': 'N',
+    'float': 'f',
+    'double': 'd'
+}
+
+
+byte_order_prefixes = {
+    'little': '<',
+    'big': '>',
+    'native': '='
+}
+
+
+def byte_order_prefix(byte_order):
+    """Returns the struct format prefix for the given byte order.
+
+    Native byte order uses standard sizes so the layout does not change.
+    """
+
+    return byte_order_prefixes[byte_order]
+
+
+def format_string(members, size=None):
+    """Returns the struct format string for the given members.
+
+    Gaps between member offsets become "x" pad bytes.
+
+    Args:
+        members: A sequence of DataMembers without struct members, such as
+            Struct.fields
+
+        size: The total size. Pad bytes are added after the last member to
+            reach it.
+    """
+
     result = ''
+    end = members[0].offset if members else 0
 
     for prop in members:
         type = prop.type
+        result += 'x' * (prop.offset - end)
+        end = prop.offset + prop.size
 
         if type == 'char' and prop.length > 1:
             format = f'{prop.length}s'
             result += format
 
         else:
-            format = {
-                'char': 'c',
-                'signed char': 'b',
-                'unsigned char': 'B',
-                'short': 'h',
-                'unsigned short': 'H',
-                'int': 'i',
-                'unsigned int': 'I',
-                'long': 'l',
-                'unsigned long': 'L',
-                'long long': 'q',
-                'unsigned long long': 'Q',
-                'ssize_t': 'n',
-                'size_t': 'N',
-                'float': 'f',
-                'double': 'd'
-            }[type]
+            format = format_characters[type]
 
             result += format * prop.length
 
+    if size is not None:
+        result += 'x' * (size - end)
+
     return simplify_format_string(result)
 
 
+def argument_names(fields):
+    """Returns the constructor argument names for fields, comma separated"""
+
+    return ', '.join(f.name for field in fields for f in field.unpack)
+
+
+def type_format(member):
+    """Returns the format character for a single element of member"""
+
+    return format_characters[member.type]
+
+
 RepeatedChar = namedtuple('RepeatedChar', ['count', 'char'])
 
 
@@ -124,4 +173,16 @@ def test_data(member):
 
         value_generators[member.type] = value_generator()
 
-        return next(value_generators[member.type])
\ No newline at end of file
+        return next(value_generators[member.type])
+
+
+filters = {
+    'byteorderprefix': byte_order_prefix,
+    'formatstring': format_string,
+    'typeformat': type_format,
+    'argumentnames': argument_names,
+    'spaces': spaces,
+    'snakecase': snake_case,
+    'pascalcase': pascal_case,
+    'testdata': test_data
+}
@@ -1,34 +1,151 @@
+import hashlib
+import marshal
 import os
+import sys
+import types
 
 from collections import namedtuple
 
+import jinja2
+
 from jinja2 import Environment
 
+from ..common import OutputSink, cache_directory
+
 
 Generator = namedtuple('Generator', ['generate_project'])
 
 
 def get_generator(template_string, filters=None):
-    def generate_project(program, out_directory):
-        env = Environment()
-
-        if filters:
-            import importlib
-
-            module = os.path.basename(filters).split('.')[0]
-            spec = importlib.util.spec_from_file_location(module, filters)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            module_filters = module.filters if hasattr(module, 'filters') else {}
-            env.filters = {**env.filters, **module_filters}
+    env = create_environment(filters)
+    template = load_template(env, template_string)
 
+    def generate_project(program, out_directory):
         file_path = os.path.join(out_directory, program.name)
 
-        template = env.from_string(template_string)
+        sink = OutputSink()
+        sink.add(file_path, template.generate(program=program))
 
-        with open(file_path, 'w') as file:
-            file.write(template.render(program=program))
+        return sink.flush()
 
     return Generator(
         generate_project=generate_project
     )
+
+
+def create_environment(filters=None):
+    """Creates an Environment with the filters from the given module.
+
+    Args:
+        filters: An optional path to a Python module file that has a "filters"
+            dictionary attribute.
+
+    Returns:
+        An Environment
+    """
+
+    env = Environment()
+
+    if filters:
+        import importlib.util
+
+        module = os.path.basename(filters).split('.')[0]
+        spec = importlib.util.spec_from_file_location(module, filters)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module_filters = module.filters if hasattr(module, 'filters') else {}
+        env.filters = {**env.filters, **module_filters}
+
+    return env
+
+
+def _filter_kind(filter):
+    """Returns how jinja2 passes arguments to the given filter."""
+
+    for kind in ['contextfilter', 'evalcontextfilter', 'environmentfilter']:
+        if getattr(filter, kind, False):
+            return kind
+
+    return str(getattr(filter, 'jinja_pass_arg', ''))
+
+
+def compiled_template_path(env, template_string):
+    """Returns the path of the compiled template in the user cache.
+
+    The path is keyed on the template text, the jinja2 and Python versions the
+    code was compiled with and the names and kinds of the environment filters,
+    since compiled code calls filters according to their kind.
+    """
+
+    filters = sorted(f'{name}:{_filter_kind(filter)}' for name, filter in env.filters.items())
+
+    digest = hashlib.sha256()
+    digest.update(f'{jinja2.__version__}:{sys.version}'.encode('utf-8'))
+    digest.update('\n'.join(filters).encode('utf-8'))
+    digest.update(template_string.encode('utf-8'))
+
+    return os.path.join(cache_directory(), 'templates', f'{digest.hexdigest()}.cache')
+
+
+def compile_template(template_string, filters=None):
+    """Compiles a template and stores the code in the user cache.
+
+    Args:
+        template_string: The template text
+
+        filters: An optional path to a Python module file that has a "filters"
+            dictionary attribute.
+
+    Returns:
+        The path of the compiled template
+    """
+
+    env = create_environment(filters)
+    path = compiled_template_path(env, template_string)
+
+    _store_code(path, env.compile(template_string))
+
+    return path
+
+
+def load_template(env, template_string):
+    """Loads a template, compiling and caching it if it hasn't been already.
+
+    Args:
+        env: The Environment to load the template into
+
+        template_string: The template text
+
+    Returns:
+        A Template
+    """
+
+    path = compiled_template_path(env, template_string)
+
+    try:
+        with open(path, 'rb') as file:
+            code = marshal.load(file)
+
+    except (OSError, EOFError, ValueError, TypeError):
+        code = None
+
+    if not isinstance(code, types.CodeType):
+        code = env.compile(template_string)
+        _store_code(path, code)
+
+    return env.template_class.from_code(env, code, env.make_globals(None))
+
+
+def _store_code(path, code):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temporary file first so readers never see partial code
+        temp_path = f'{path}.{os.getpid()}'
+        with open(temp_path, 'wb') as file:
+            marshal.dump(code, file)
+
+        os.replace(temp_path, path)
+
+    except OSError:
+        pass
@@ -4,7 +4,7 @@ from wick.common import Program
 from . import parser
 
 
-def parse(uri, source):
+def parse(uri, source, errors=None, layout='packed', byte_order='little'):
     """Parses the given source text
 
     Args:
@@ -12,6 +12,15 @@ def parse(uri, source):
 
         source: C source text that only contains structs with simple types.
 
+        errors: An optional list to collect error messages in. If omitted,
+            errors are printed to stderr.
+
+        layout: How struct members are aligned: "packed", "natural" or
+            "pack(n)".
+
+        byte_order: The byte order of multibyte values: "little", "big" or
+            "native".
+
     Returns:
         A Program
     """
@@ -20,8 +29,15 @@ def parse(uri, source):
 
     # Report errors
     for error in parse_tree.errors:
-        print(error, file=sys.stderr)
+        start = error.range.start
+        message = f'{uri}:{start.line + 1}:{start.character + 1}: {error.message}'
+
+        if errors is None:
+            print(message, file=sys.stderr)
+
+        else:
+            errors.append(message)
 
-    program = Program(uri, parse_tree)
+    program = Program(uri, parse_tree, layout, byte_order)
 
     return program
@@ -9,8 +9,8 @@ class Position:
 
 class Range:
     def __init__(self, start, end):
-        self.start = Position(*start)
-        self.end = Position(*end)
+        self.start = start if isinstance(start, Position) else Position(*start)
+        self.end = end if isinstance(end, Position) else Position(*end)
 
     def contains(self, position: Position):
         if position.line < self.start.line:
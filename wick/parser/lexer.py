@@ -1,7 +1,8 @@
 import re
 
+from bisect import bisect_right
 from collections import namedtuple
-from typing import Any, Callable, Union
+from typing import Any, Callable, List, Union
 
 from .common import Position, Range
 
@@ -35,6 +36,29 @@ class Lexer:
         self._program = program
         self._rules = []
         self._lexing = False
+        self._line_offsets = find_line_offsets(program)
+        self._start = 0
+        self._end = 0
+
+    @property
+    def range(self) -> Range:
+        """The Range of the lexeme currently being processed."""
+
+        return Range(self.position(self._start), self.position(self._end))
+
+    def position(self, offset: int) -> Position:
+        """Converts an offset into the source text to a Position.
+
+        Args:
+            offset: The character offset into the source text
+
+        Returns:
+            A Position
+        """
+
+        line = bisect_right(self._line_offsets, offset) - 1
+
+        return Position(line, offset - self._line_offsets[line])
 
     def add_rule(self, regex: str, callback: Callable[[str], Any]):
         """Adds a rule for lexing.
@@ -50,7 +74,7 @@ class Lexer:
         # Sanitize regex. Make capturing groups non-capturing.
         regex = re.sub('\((?!\?:)', '(?:', regex)
 
-        self._rules.append(Rule(f'({regex})', callback))
+        self._rules.append(Rule(regex, callback))
 
     def lex(self) -> Union[Any, None]:
         """Get the next lexeme result.
@@ -71,13 +95,15 @@ class Lexer:
                 raise LexError('Cannot lex without rules')
 
             def generator():
-                pattern = re.compile('|'.join([r.regex for r in self._rules]))
-
-                for matches in pattern.findall(self._program):
-                    matches = (matches,) if not type(matches) == tuple else matches
-                    match, rule = [pair for pair in zip(matches, self._rules) if pair[0]][0]
-
-                    result = rule.callback(match)
+                # Each rule gets a named group so the matching rule can be
+                # looked up directly from the match object.
+                groups = [f'(?P<rule{i}>{r.regex})' for i, r in enumerate(self._rules)]
+                callbacks = {f'rule{i}': r.callback for i, r in enumerate(self._rules)}
+                pattern = re.compile('|'.join(groups))
+
+                for match in pattern.finditer(self._program):
+                    self._start, self._end = match.span()
+                    result = callbacks[match.lastgroup](match.group())
                     if result:
                         yield result
 
@@ -89,35 +115,25 @@ class Lexer:
         return next(self._generator)
 
 
-line = 0
-character = 0
-last_position = Position(line, character)
-current_position = Position(line, character)
-
-
-def update_position(string):
-    """Updates the current position of the Lexer.
+def find_line_offsets(program: str) -> List[int]:
+    """Finds the offset of the first character of every line.
 
     Args:
-        string: The match string being processed
-    """
-    global line, character, last_position, current_position
-    last_position = Position(line, character)
+        program: The source text
 
-    for c in string:
-        if c == '\n':
-            line += 1
-            character = 0
-        else:
-            character += 1
+    Returns:
+        A sorted list of offsets
+    """
 
-    current_position = Position(line, character)
+    return [0] + [m.end() for m in re.finditer('\n', program)]
 
 
-def process_lexeme(type: str=None) -> Callable[[str], Union[Token, None]]:
+def process_lexeme(lexer: Lexer, type: str=None) -> Callable[[str], Union[Token, None]]:
     """Construct a function for processing the given type
 
     Args:
+        lexer: The Lexer the function will be added to
+
         type: The type of the matched lexeme. If omitted the inner function
             will not return a Token.
 
@@ -134,11 +150,8 @@ def process_lexeme(type: str=None) -> Callable[[str], Union[Token, None]]:
         Returns:
             A Token if type was provided by the outer function, otherwise None.
         """
-        update_position(lexeme)
-
         if type:
-            range = Range(last_position, current_position)
-            return Token(type, lexeme, range)
+            return Token(type, lexeme, lexer.range)
 
     return callback
 
@@ -153,35 +166,29 @@ def new_lexer(program: str) -> Lexer:
         A Lexer
     """
 
-    global line, character, last_position, current_position
-    line = 0
-    character = 0
-    last_position = Position(line, character)
-    current_position = Position(line, character)
-
     lexer = Lexer(program)
 
     # Comments
-    lexer.add_rule('\/\*([^*]|[\r\n]|(\*+([^*/]|[\r\n])))*\*\/', process_lexeme('comment'))
-    #lexer.add_rule('\/\/.*', process_lexeme('comment'))
-    lexer.add_rule('\/\/.*(\n\s*\/\/.*)*', process_lexeme('comment'))
+    lexer.add_rule('\/\*([^*]|[\r\n]|(\*+([^*/]|[\r\n])))*\*\/', process_lexeme(lexer, 'comment'))
+    #lexer.add_rule('\/\/.*', process_lexeme(lexer, 'comment'))
+    lexer.add_rule('\/\/.*(\n\s*\/\/.*)*', process_lexeme(lexer, 'comment'))
 
     # Literals
-    lexer.add_rule('[0-9]+', process_lexeme('number'))
+    lexer.add_rule('[0-9]+', process_lexeme(lexer, 'number'))
 
     # Types
-    lexer.add_rule('\\b(char|signed char|unsigned char|bool|short|unsigned short|int|unsigned int|long long|unsigned long long|long|unsigned long|float|double)\\b', process_lexeme('type'))
+    lexer.add_rule('\\b(char|signed char|unsigned char|bool|short|unsigned short|int|unsigned int|long long|unsigned long long|long|unsigned long|float|double)\\b', process_lexeme(lexer, 'type'))
 
     # Names
-    lexer.add_rule('[A-Za-z_]+[A-Za-z0-9_]*', process_lexeme('name'))
+    lexer.add_rule('[A-Za-z_]+[A-Za-z0-9_]*', process_lexeme(lexer, 'name'))
 
     # Operators
-    lexer.add_rule('(\[|\]|\{|\}|;|,)', process_lexeme('operator'))
+    lexer.add_rule('(\[|\]|\{|\}|;|,)', process_lexeme(lexer, 'operator'))
 
     # Whitespace
-    lexer.add_rule('[\s]+', process_lexeme())
+    lexer.add_rule('[\s]+', process_lexeme(lexer))
 
     # Everything else. This is for keeping correct positioning.
-    lexer.add_rule('.', process_lexeme())
+    lexer.add_rule('.', process_lexeme(lexer))
 
     return lexer
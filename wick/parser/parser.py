@@ -1,22 +1,37 @@
-import copy
-
 from collections import namedtuple
-from types import MethodType
 from typing import Callable, List, Union
 
 from .common import Range
 from .lexer import new_lexer
 
-lexer = None
-
 
 class Context:
-    token = None
-    symbol_table = {}
-    scope = None
-    symbols = []
-    errors = []
-    comments = []
+    """Parser state for a single parse.
+
+    Attributes:
+        lexer: The Lexer providing tokens
+
+        token: The current Symbol
+
+        symbol_table: A dict of prototype Symbols keyed by id
+
+        scope: The current Scope
+
+        symbols: A list of all Symbols created
+
+        errors: A list of Diagnostics
+
+        comments: A list of comment Tokens
+    """
+
+    def __init__(self, symbol_table: dict=None, lexer=None):
+        self.lexer = lexer
+        self.token = None
+        self.symbol_table = symbol_table if symbol_table is not None else {}
+        self.scope = None
+        self.symbols = []
+        self.errors = []
+        self.comments = []
 
 
 Diagnostic = namedtuple('Diagnostic', ['range', 'severity', 'message'])
@@ -26,9 +41,16 @@ ParseTree = namedtuple('ParseTree', ['ast', 'scope', 'symbols', 'errors', 'comme
 class Object:
     @staticmethod
     def create(prototype):
-        """Creates a new object from the given prototype"""
+        """Creates a new object from the given prototype.
 
-        return copy.deepcopy(prototype)
+        This is a shallow copy. Behavior lives on the prototype's class, so
+        only instance state needs to be copied.
+        """
+
+        obj = object.__new__(type(prototype))
+        obj.__dict__.update(prototype.__dict__)
+
+        return obj
 
 
 class Symbol:
@@ -38,6 +60,7 @@ class Symbol:
         self.scope = None
         self.value = ''
         self.range = Range((-1, -1), (-1, -1))
+        self.context = None
 
     def nud(self) -> 'Symbol':
         """Null denotation parser.
@@ -94,7 +117,7 @@ class Symbol:
 
         range = range or self.range
 
-        Context.errors.append(Diagnostic(
+        self.context.errors.append(Diagnostic(
             range,
             severity,
             message
@@ -105,10 +128,11 @@ MaybeSymbol = Union[Symbol,None]
 
 
 class Scope:
-    def __init__(self, parent_scope: 'Scope'=None):
+    def __init__(self, context: Context, parent_scope: 'Scope'=None):
+        self.context = context
         self.definitions = {}
-        self.parent = Context.scope or parent_scope
-        Context.scope = self
+        self.parent = context.scope or parent_scope
+        context.scope = self
 
     def define(self, symbol: Symbol, type: Symbol) -> Symbol:
         """Defines the given symbol in the current scope.
@@ -133,11 +157,10 @@ class Scope:
             self.definitions[symbol.value] = symbol
 
         symbol.reserved = False
-        symbol.nud = MethodType(itself, symbol)
         symbol.led = None
         symbol.std = None
         symbol.lbp = 0
-        symbol.scope = Context.scope
+        symbol.scope = self.context.scope
         symbol.type = type
 
         return symbol
@@ -163,15 +186,15 @@ class Scope:
             current_scope = current_scope.parent
 
             if not current_scope:
-                p = Context.symbol_table.get(symbol)
+                p = self.context.symbol_table.get(symbol)
 
                 if p:
                     return p
 
-                return Context.symbol_table.get('(name)')
+                return self.context.symbol_table.get('(name)')
 
     def push(self, scope: 'Scope'):
-        """Opens a Scope and sets the given scope as the Context.scope.
+        """Opens a Scope and sets the given scope as the context scope.
 
         This will not change the parent of the given scope.
 
@@ -179,14 +202,14 @@ class Scope:
             scope: The Scope to push
         """
 
-        if scope.parent != Context.scope:
+        if scope.parent != self.context.scope:
             raise Exception('Bad scope pushed')
 
-        Context.scope = scope
+        self.context.scope = scope
 
     def pop(self):
-        """Closes a Scope and sets Context.scope to Context.scope.parent."""
-        Context.scope = self.parent
+        """Closes a Scope and sets the context scope to its parent."""
+        self.context.scope = self.parent
 
     def reserve(self, symbol: Symbol):
         """Indicate that the given symbol is a reserved word.
@@ -221,10 +244,12 @@ class Define:
     """Namespace for defining language constructs"""
 
     @staticmethod
-    def symbol(id: str, bp: int=0) -> Symbol:
+    def symbol(context: Context, id: str, bp: int=0) -> Symbol:
         """Defines a symbol with the given id and left binding power.
 
         Args:
+            context: The Context to define the symbol in
+
             id: Symbol id
 
             bp: Left binding power
@@ -233,7 +258,7 @@ class Define:
             A Symbol
         """
 
-        s = Context.symbol_table.get(id)
+        s = context.symbol_table.get(id)
 
         if s:
             if bp >= s.lbp:
@@ -250,15 +275,17 @@ class Define:
             s.id = id
             s.value = id
             s.lbp = bp
-            Context.symbol_table[id] = s
+            context.symbol_table[id] = s
 
         return s
 
     @staticmethod
-    def infix(id: str, bp: int, led: Callable[[Symbol], Symbol]=None) -> Symbol:
+    def infix(context: Context, id: str, bp: int, led: Callable[[Symbol], Symbol]=None) -> Symbol:
         """Defines an infix operator.
 
         Args:
+            context: The Context to define the symbol in
+
             id: Symbol id
 
             bp: Left binding power
@@ -269,28 +296,27 @@ class Define:
             A Symbol
         """
 
-        symbol = Define.symbol(id, bp)
+        symbol = Define.symbol(context, id, bp)
 
         if not led:
             def led(self, left):
                 self.first = left
-                self.second = Parse.expression(bp)
+                self.second = Parse.expression(self.context, bp)
                 self.arity = 'binary'
 
                 return self
 
-            symbol.led = MethodType(led, symbol)
-
-        else:
-            symbol.led = MethodType(led, symbol)
+        type(symbol).led = led
 
         return symbol
 
     @staticmethod
-    def infixr(id: str, bp: int, led: Callable[[Symbol], Symbol]=None) -> Symbol:
+    def infixr(context: Context, id: str, bp: int, led: Callable[[Symbol], Symbol]=None) -> Symbol:
         """Defines a right-associative infix operator.
 
         Args:
+            context: The Context to define the symbol in
+
             id: Symbol id
 
             bp: Left binding power
@@ -301,28 +327,27 @@ class Define:
             A Symbol
         """
 
-        symbol = Define.symbol(id, bp)
+        symbol = Define.symbol(context, id, bp)
 
         if not led:
             def led(self, left):
                 self.first = left
-                self.second = Parse.expression(bp - 1)
+                self.second = Parse.expression(self.context, bp - 1)
                 self.arity = 'binary'
 
                 return self
 
-            symbol.led = MethodType(led, symbol)
-
-        else:
-            symbol.led = MethodType(led, symbol)
+        type(symbol).led = led
 
         return symbol
 
     @staticmethod
-    def prefix(id: str, nud: Callable[[], Symbol]=None) -> Symbol:
+    def prefix(context: Context, id: str, nud: Callable[[], Symbol]=None) -> Symbol:
         """Defines a prefix operator.
 
         Args:
+            context: The Context to define the symbol in
+
             id: Symbol id
 
             nud: Null denotation parsing function
@@ -331,28 +356,27 @@ class Define:
             A Symbol
         """
 
-        symbol = Define.symbol(id)
+        symbol = Define.symbol(context, id)
 
         if not nud:
             def nud(self):
-                Context.scope.reserve(self)
-                self.first = Parse.expression(70)
+                self.context.scope.reserve(self)
+                self.first = Parse.expression(self.context, 70)
                 self.arity = 'unary'
 
                 return self
 
-            symbol.nud = MethodType(nud, symbol)
-
-        else:
-            symbol.nud = MethodType(nud, symbol)
+        type(symbol).nud = nud
 
         return symbol
 
     @staticmethod
-    def assignment(id: str) -> Symbol:
+    def assignment(context: Context, id: str) -> Symbol:
         """Defines an assignment expression.
 
         Args:
+            context: The Context to define the symbol in
+
             id: Symbol id
 
         Returns:
@@ -361,177 +385,191 @@ class Define:
 
         def led(self, left):
             self.first = left
-            self.second = Parse.expression(9)
+            self.second = Parse.expression(self.context, 9)
             self.assignment = True
             self.arity = 'binary'
 
             return self
 
-        return Define.infix(id, 10, led)
+        return Define.infix(context, id, 10, led)
 
     @staticmethod
-    def statement(id: str, std: Callable[[], Symbol]) -> MaybeSymbol:
+    def statement(context: Context, id: str, std: Callable[[], Symbol]) -> MaybeSymbol:
         """Defines a statement.
 
         Args:
+            context: The Context to define the symbol in
+
             id: Symbol id
 
             std: Statement denotation parser
         """
 
-        symbol = Define.symbol(id)
-        symbol.std = MethodType(std, symbol)
+        symbol = Define.symbol(context, id)
+        type(symbol).std = std
 
         return symbol
 
     @staticmethod
-    def structure(id: str, srd: Callable[[], Symbol]) -> MaybeSymbol:
+    def structure(context: Context, id: str, srd: Callable[[], Symbol]) -> MaybeSymbol:
         """Defines a structure
 
         Args:
+            context: The Context to define the symbol in
+
             id: Symbol id
 
             srd: Structure denotation parser
         """
 
-        symbol = Define.symbol(id)
-        symbol.srd = MethodType(srd, symbol)
+        symbol = Define.symbol(context, id)
+        type(symbol).srd = srd
 
 
 class Parse:
     """Namespace for parsing language constructs"""
 
     @staticmethod
-    def advance(id: str=None) -> Symbol:
+    def advance(context: Context, id: str=None) -> Symbol:
         """Create a new Symbol from the token stream.
 
-        This new symbol will also be set as Context.token. An optional token id
-        can be provided to verify the id of the current token.
+        This new symbol will also be set as the context token. An optional
+        token id can be provided to verify the id of the current token.
 
         Args:
+            context: The Context to parse with
+
             id: Expected id of current token. Will report an error on mismatch.
 
         Returns:
             A Symbol
         """
 
-        global lexer
-
-        if id and Context.token.id != id:
-            Context.token.error(f'Expected: "{id}" Actual: "{Context.token.id}"')
+        if id and context.token.id != id:
+            context.token.error(f'Expected: "{id}" Actual: "{context.token.id}"')
 
-        next_token = lexer.lex()
+        next_token = context.lexer.lex()
 
         if not next_token:
-            Context.token = Context.symbol_table.get('(end)')
-            Context.token.range = Range((-1, -1), (-1, -1))
+            context.token = context.symbol_table.get('(end)')
+            context.token.range = Range((-1, -1), (-1, -1))
+            context.token.context = context
 
-            return Context.token
+            return context.token
 
         value = next_token.value
         arity = next_token.type
 
         if arity == 'name':
-            prototype_object = Context.scope.find(value)
+            prototype_object = context.scope.find(value)
 
         elif arity == 'operator':
-            prototype_object = Context.symbol_table.get(value)
+            prototype_object = context.symbol_table.get(value)
 
             if not prototype_object:
                 next_token.error(f'Unknown operator: "{value}"')
 
         elif arity == 'number':
-            ff = Context.symbol_table.get(arity)
+            ff = context.symbol_table.get(arity)
 
             arity = 'literal'
-            prototype_object = Context.symbol_table.get('(literal)')
+            prototype_object = context.symbol_table.get('(literal)')
 
             if ff:
                 prototype_object.type = ff
 
         elif arity == 'type':
             arity = 'type'
-            prototype_object = Context.scope.find(value)
+            prototype_object = context.scope.find(value)
 
         elif arity == 'comment':
-            Context.comments.append(next_token)
-            return Parse.advance(id)
+            context.comments.append(next_token)
+            return Parse.advance(context, id)
 
         else:
             next_token.error(f'Unexpected token: "{next_token.id}"')
 
-        Context.token = Object.create(prototype_object)
-        Context.token.value = value
-        Context.token.arity = arity
-        Context.token.range = next_token.range
+        context.token = Object.create(prototype_object)
+        context.token.value = value
+        context.token.arity = arity
+        context.token.range = next_token.range
+        context.token.context = context
 
-        if not Context.token.scope and Context.token.arity == 'name':
-            Context.token.scope = Context.scope
+        if not context.token.scope and context.token.arity == 'name':
+            context.token.scope = context.scope
 
-        if Context.token.scope and Context.token.scope != Context.scope:
-            Context.token.scope = Context.scope
+        if context.token.scope and context.token.scope != context.scope:
+            context.token.scope = context.scope
 
-        Context.symbols.append(Context.token)
+        context.symbols.append(context.token)
 
-        return Context.token
+        return context.token
 
     @staticmethod
-    def expression(rbp: int) -> Symbol:
+    def expression(context: Context, rbp: int) -> Symbol:
         """Parses an expression.
 
         Args:
+            context: The Context to parse with
+
             rbp: Right binding power
 
         Returns:
             A Symbol
         """
 
-        current_token = Context.token
-        Parse.advance()
+        current_token = context.token
+        Parse.advance(context)
         left = current_token.nud()
 
-        while rbp < Context.token.lbp:
-            current_token = Context.token
-            Parse.advance()
+        while rbp < context.token.lbp:
+            current_token = context.token
+            Parse.advance(context)
             left = current_token.led(left)
 
         return left
 
     @staticmethod
-    def statement() -> MaybeSymbol:
+    def statement(context: Context) -> MaybeSymbol:
         """Parses a statement.
 
+        Args:
+            context: The Context to parse with
+
         Returns:
             A Symbol
         """
-        current_token = Context.token
+        current_token = context.token
 
         if hasattr(current_token, 'std'):
-            Parse.advance()
-            Context.scope.reserve(current_token)
+            Parse.advance(context)
+            context.scope.reserve(current_token)
 
             return current_token.std()
 
         else:
             current_token.error(f'Unexpected symbol: {current_token.value}')
-            Parse.advance()
+            Parse.advance(context)
 
         return None
 
     @staticmethod
-    def statements() -> List[Symbol]:
+    def statements(context: Context) -> List[Symbol]:
         """Parses a sequence of statements.
 
+        Args:
+            context: The Context to parse with
+
         Returns:
             Symbol
         """
         parsed_statements = []
 
         while True:
-            if Context.token.id == '}' or Context.token.id == '(end)':
+            if context.token.id == '}' or context.token.id == '(end)':
                 break
 
-            statement = Parse.statement()
+            statement = Parse.statement(context)
 
             if statement:
                 parsed_statements.append(statement)
@@ -539,40 +577,46 @@ class Parse:
         return parsed_statements
 
     @staticmethod
-    def structure() -> MaybeSymbol:
+    def structure(context: Context) -> MaybeSymbol:
         """Parses a structure.
 
+        Args:
+            context: The Context to parse with
+
         Returns:
             A Symbol
         """
-        current_token = Context.token
+        current_token = context.token
 
         if hasattr(current_token, 'srd'):
-            Parse.advance()
-            Context.scope.reserve(current_token)
+            Parse.advance(context)
+            context.scope.reserve(current_token)
 
             return current_token.srd()
 
         else:
             current_token.error(f'Unexpected symbol: {current_token.value}')
-            Parse.advance()
+            Parse.advance(context)
 
         return None
 
     @staticmethod
-    def structures() -> List[Symbol]:
+    def structures(context: Context) -> List[Symbol]:
         """Parses a sequence of structures.
 
+        Args:
+            context: The Context to parse with
+
         Returns:
             Symbol
         """
         parsed_structures = []
 
         while True:
-            if Context.token.id == '}' or Context.token.id == '(end)':
+            if context.token.id == '}' or context.token.id == '(end)':
                 break
 
-            structure = Parse.structure()
+            structure = Parse.structure(context)
 
             if structure:
                 parsed_structures.append(structure)
@@ -580,9 +624,9 @@ class Parse:
         return parsed_structures
 
     @staticmethod
-    def block() -> Symbol:
-        current_token = Context.token
-        Parse.advance('{')
+    def block(context: Context) -> Symbol:
+        current_token = context.token
+        Parse.advance(context, '{')
 
         return current_token.std()
 
@@ -591,139 +635,194 @@ def itself(self: Symbol) -> Symbol:
     return self
 
 
-Define.symbol(',')
-Define.symbol(';')
-Define.symbol("{")
-Define.symbol("}")
-Define.symbol("[")
-Define.symbol("]")
+grammar = Context()
+
+Define.symbol(grammar, ',')
+Define.symbol(grammar, ';')
+Define.symbol(grammar, "{")
+Define.symbol(grammar, "}")
+Define.symbol(grammar, "[")
+Define.symbol(grammar, "]")
 
-Define.symbol('(end)')
-s = Define.symbol('(literal)')
-s.nud = MethodType(itself, s)
-s = Define.symbol('(type)')
-s.nud = MethodType(itself, s)
-s = Define.symbol('(name)')
-s.nud = MethodType(itself, s)
+Define.symbol(grammar, '(end)')
+s = Define.symbol(grammar, '(literal)')
+type(s).nud = itself
+s = Define.symbol(grammar, '(type)')
+type(s).nud = itself
+s = Define.symbol(grammar, '(name)')
+type(s).nud = itself
 
 
 def variable_std(self: Symbol):
     """Variable declaration statement denotation parser."""
 
+    context = self.context
+
     while True:
         # Ignore variables defined outside of a struct
-        if Context.scope.is_global():
+        if context.scope.is_global():
             return None
 
-        current_token = Context.token
+        current_token = context.token
 
         if current_token.arity != 'name':
             current_token.error('Expected a new variable name')
 
-        Context.scope.define(current_token, self)
-        Parse.advance()
+        context.scope.define(current_token, self)
+        Parse.advance(context)
 
-        if Context.token.id == '[':
-            Parse.advance('[')
-            exp = Parse.expression(0)
-            Parse.advance(']')
+        if context.token.id == '[':
+            Parse.advance(context, '[')
+            exp = Parse.expression(context, 0)
+            Parse.advance(context, ']')
             current_token.dimension = exp
 
-        if Context.token.id != ',':
+        if context.token.id != ',':
             break
 
-        Parse.advance(',')
-    Parse.advance(';')
+        Parse.advance(context, ',')
+    Parse.advance(context, ';')
 
     return None
 
 
-Define.statement('char', variable_std)
-Define.statement('signed char', variable_std)
-Define.statement('unsigned char', variable_std)
-Define.statement('bool', variable_std)
-Define.statement('short', variable_std)
-Define.statement('unsigned short', variable_std)
-Define.statement('int', variable_std)
-Define.statement('unsigned int', variable_std)
-Define.statement('long long', variable_std)
-Define.statement('unsigned long long', variable_std)
-Define.statement('long', variable_std)
-Define.statement('unsigned long', variable_std)
-Define.statement('float', variable_std)
-Define.statement('double', variable_std)
+Define.statement(grammar, 'char', variable_std)
+Define.statement(grammar, 'signed char', variable_std)
+Define.statement(grammar, 'unsigned char', variable_std)
+Define.statement(grammar, 'bool', variable_std)
+Define.statement(grammar, 'short', variable_std)
+Define.statement(grammar, 'unsigned short', variable_std)
+Define.statement(grammar, 'int', variable_std)
+Define.statement(grammar, 'unsigned int', variable_std)
+Define.statement(grammar, 'long long', variable_std)
+Define.statement(grammar, 'unsigned long long', variable_std)
+Define.statement(grammar, 'long', variable_std)
+Define.statement(grammar, 'unsigned long', variable_std)
+Define.statement(grammar, 'float', variable_std)
+Define.statement(grammar, 'double', variable_std)
+
+
+def struct_member_std(struct_symbol: Symbol) -> Callable[[], Symbol]:
+    """Returns a statement denotation parser for members of the given struct
+    type.
+
+    Struct names and typedef names get one of these, so they can be used as
+    member types without the struct keyword.
+    """
+
+    def std():
+        if struct_symbol.inner_scope is None:
+            struct_symbol.context.token.error(f'Incomplete struct: {struct_symbol.value}')
+
+        return variable_std(struct_symbol)
+
+    return std
+
+
+def struct_std(self: Symbol):
+    """Struct member declaration statement denotation parser."""
+
+    context = self.context
+    current_token = context.token
+
+    # Only structs that were already defined can be used as member types. The
+    # token is a copy of the definition found through the scope chain.
+    if not hasattr(current_token, 'inner_scope') or getattr(current_token.type, 'value', None) != 'struct':
+        current_token.error(f'Unknown struct: {current_token.value}')
+
+        # Skip the rest of the declaration
+        while context.token.id not in (';', '}', '(end)'):
+            Parse.advance(context)
+
+        if context.token.id == ';':
+            Parse.advance(context, ';')
+
+        return None
+
+    if current_token.inner_scope is None:
+        current_token.error(f'Incomplete struct: {current_token.value}')
+
+    Parse.advance(context)
+
+    return variable_std(context.scope.find(current_token.value))
+
+
+Define.statement(grammar, 'struct', struct_std)
 
 
 def struct_srd(self: Symbol):
     """Struct statement denotation parser"""
 
-    current_token = Context.token
+    context = self.context
+
+    current_token = context.token
     name_token = None
 
     if current_token.arity == 'name':
-        Context.scope.define(current_token, self)
+        context.scope.define(current_token, self)
+        current_token.inner_scope = None
+        current_token.std = struct_member_std(current_token)
         name_token = current_token
-        Parse.advance()
+        Parse.advance(context)
 
-    if Context.token.id == ';':
-        Parse.advance(';')
-        current_token.inner_scope = None
+    if context.token.id == ';':
+        Parse.advance(context, ';')
         return None
 
-    Parse.advance('{')
+    Parse.advance(context, '{')
 
-    Scope()
-    Parse.statements()
-    inner_scope = Context.scope
-    Parse.advance('}')
-    Context.scope.pop()
+    Scope(context)
+    Parse.statements(context)
+    inner_scope = context.scope
+    Parse.advance(context, '}')
+    context.scope.pop()
 
     # Handle typedef aliases
-    if Context.token.arity == 'name':
-        Context.scope.define(Context.token, self)
+    if context.token.arity == 'name':
+        context.scope.define(context.token, self)
 
         if name_token:
-            current_token.alias = Context.token
-            Context.token.is_alias = True
+            current_token.alias = context.token
+            context.token.is_alias = True
+            context.token.std = struct_member_std(name_token)
         else:
-            name_token = Context.token
+            name_token = context.token
+            name_token.std = struct_member_std(name_token)
 
-        Parse.advance()
+        Parse.advance(context)
 
     name_token.inner_scope = inner_scope
-    Parse.advance(';')
+    Parse.advance(context, ';')
 
     return None
 
 
-Define.structure('struct', struct_srd)
+Define.structure(grammar, 'struct', struct_srd)
 
 
 def typedef_srd(self: Symbol):
-    return Parse.structure()
+    return Parse.structure(self.context)
 
 
-Define.structure('typedef', typedef_srd)
+Define.structure(grammar, 'typedef', typedef_srd)
 
 
 def parse(source_text: str) -> ParseTree:
     """Parses the given source text.
 
+    Each call parses with its own Context, so it is safe to parse from
+    multiple threads at once.
+
     Returns:
         A ParseTree
     """
 
-    global lexer
-    lexer = new_lexer(source_text)
-
-    Context.token = None
-    Context.symbol_table = Object.create(Context.symbol_table)
-    Context.symbols = []
-    Context.errors = []
-    Context.scope = Scope()
+    symbol_table = {id: Object.create(s) for id, s in grammar.symbol_table.items()}
+    context = Context(symbol_table, new_lexer(source_text))
+    Scope(context)
 
-    Parse.advance()
-    ast = Parse.structures()
-    scope = Context.scope
+    Parse.advance(context)
+    ast = Parse.structures(context)
+    scope = context.scope
 
-    return ParseTree(ast, scope, Context.symbols, Context.errors, Context.comments)
+    return ParseTree(ast, scope, context.symbols, context.errors, context.comments)
@@ -0,0 +1,149 @@
+import os
+import sys
+import time
+
+import wick
+
+from . import generators
+
+
+class Watcher:
+    """Regenerates sources when they change.
+
+    The generator is created once, so templates stay loaded and compiled
+    between changes.
+    """
+
+    def __init__(self, get_sources, language, outdir, debounce=0.05, layout='packed', byte_order='little', **options):
+        """Constructor
+
+        Args:
+            get_sources: A function that returns the current list of source
+                paths. It is called on every poll so new files are picked up.
+
+            language: Target language to generate code for.
+
+            outdir: Target directory to write generated files.
+
+            debounce: Seconds a change has to settle before generating.
+
+            layout: How struct members are aligned: "packed", "natural" or
+                "pack(n)".
+
+            byte_order: The byte order of multibyte values: "little", "big"
+                or "native".
+
+            options: Language specific generator options.
+
+        Raises:
+            ValueError: If layout or byte_order is not supported
+        """
+
+        self.get_sources = get_sources
+        self.language = language
+        self.outdir = outdir
+        self.debounce = debounce
+        self.layout = layout
+        self.byte_order = byte_order
+        self.options = options
+        wick.check_layout(layout, byte_order)
+        self.generator = generators.factory.from_language(language, **options)
+        self._stats = {}
+
+    def poll(self):
+        """Returns the sources that were added or modified since the last poll.
+
+        Returns:
+            A list of source paths
+        """
+
+        stats = {}
+
+        for source_file in self.get_sources():
+            try:
+                stat = os.stat(source_file)
+                stats[source_file] = (stat.st_mtime_ns, stat.st_size)
+
+            except OSError:
+                pass
+
+        changed = [s for s, stat in stats.items() if self._stats.get(s) != stat]
+        self._stats = stats
+
+        return changed
+
+    def step(self):
+        """Polls once and regenerates changed sources.
+
+        Changes are collected until the sources stop changing for the
+        debounce interval, so a save in progress is not generated twice.
+
+        Returns:
+            A list of the regenerated source paths
+        """
+
+        changed = self.poll()
+
+        if not changed:
+            return []
+
+        while True:
+            time.sleep(self.debounce)
+            settling = self.poll()
+
+            if not settling:
+                break
+
+            changed += [s for s in settling if s not in changed]
+
+        os.makedirs(self.outdir, exist_ok=True)
+
+        for source_file in changed:
+            start = time.perf_counter()
+
+            try:
+                results = wick.generate_sources([source_file], self.language, self.outdir, self.generator, self.layout, self.byte_order, **self.options)
+                _, errors = results[source_file]
+
+            except Exception as e:
+                errors = [f'{source_file}: {e}']
+
+            for error in errors:
+                print(error, file=sys.stderr)
+
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f'Generated {source_file} in {elapsed:.0f}ms')
+
+        return changed
+
+
+def watch(get_sources, language, outdir, interval=0.2, layout='packed', byte_order='little', **options):
+    """Regenerates sources whenever they change until interrupted.
+
+    Args:
+        get_sources: A function that returns the current list of source paths.
+
+        language: Target language to generate code for.
+
+        outdir: Target directory to write generated files.
+
+        interval: Seconds between polls.
+
+        layout: How struct members are aligned: "packed", "natural" or
+            "pack(n)".
+
+        byte_order: The byte order of multibyte values: "little", "big" or
+            "native".
+
+        options: Language specific generator options.
+    """
+
+    watcher = Watcher(get_sources, language, outdir, layout=layout, byte_order=byte_order, **options)
+
+    try:
+        while True:
+            watcher.step()
+            time.sleep(interval)
+
+    except KeyboardInterrupt:
+        pass